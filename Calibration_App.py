@@ -5,7 +5,7 @@ Professional PyQt6 interface for camera calibration and measurement using ChArUc
 Modular architecture with OS-aware camera handling.
 
 Requirements:
-    pip install PyQt6 opencv-contrib-python numpy
+    pip install PyQt6 "opencv-contrib-python>=4.10" numpy
 
 To create executable:
     pip install pyinstaller
@@ -16,9 +16,11 @@ Version: 3.0 - Modular Architecture
 """
 
 import sys
+import multiprocessing
 import cv2
 import numpy as np
 import os
+from collections import deque
 from pathlib import Path
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -26,16 +28,22 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QTabWidget, QSpinBox, QDoubleSpinBox, QGroupBox,
                              QMessageBox, QFileDialog, QProgressBar, QFrame)
 from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QThread
-from PyQt6.QtGui import QImage, QPixmap, QFont, QIcon
+from PyQt6.QtGui import QFont, QIcon
 
 # Import our modules
 from config import (CALIB_FILE, EXTRINSICS_FILE, MIN_CHARUCO_CORNERS, 
-                    get_detectors, get_aruco_board)
+                    FRAME_POLL_INTERVAL_MS, LOG_FLUSH_INTERVAL_MS, LOG_MAX_LINES,
+                    MIN_OPENCV_VERSION, get_detectors, create_detectors, get_aruco_board,
+                    opencv_version_ok, configure_opencv_threads)
 from camera_utils import get_camera_source
-from video_thread import VideoThread
+from video_thread import VideoThread, ndarray_to_qimage, detect_charuco, refine_corners
 from intrinsic_calibration import IntrinsicCalibration, CalibrationWorker
 from extrinsic_calibration import ExtrinsicCalibration
 from measurements import Measurement
+from video_widget import VideoWidget
+
+# Offset of the "1"/"2" labels from their clicked points (pixels)
+CLICK_LABEL_OFFSET = np.array([10, -10], dtype=np.int32)
 
 
 class ChArUcoCalibrationGUI(QMainWindow):
@@ -46,6 +54,9 @@ class ChArUcoCalibrationGUI(QMainWindow):
         self.setWindowTitle("ChArUco Camera Calibration & Measurement Tool")
         self.setGeometry(50, 50, 4000, 3000)
         
+        # One OpenCV worker per physical core
+        configure_opencv_threads()
+        
         # Initialize detector components
         self.init_detectors()
         
@@ -62,10 +73,19 @@ class ChArUcoCalibrationGUI(QMainWindow):
         # UI state tracking
         self.current_detection = {}
         self.image_size = None
+        self.calib_worker = None
         
         # Measurement UI data
-        self.frozen_frame = None
+        self.frozen_frame = None  # QImage shown while frozen
         self.frozen_frame_raw = None  # Raw (distorted) frame for accurate measurement math
+        self.frozen_frame_bgr = None  # Undistorted BGR frozen frame that overlays are drawn on
+        # Last rendered point overlay, reused while the click points are unchanged
+        self._preview_points = None
+        self._preview_image = None
+        # View -> frozen image mapping, refreshed on freeze and view resize
+        self._click_scale = None
+        self._click_off_x = 0.0
+        self._click_off_y = 0.0
         self.click_points = []
         self.current_measure_frame = None
         
@@ -75,11 +95,32 @@ class ChArUcoCalibrationGUI(QMainWindow):
         self.rvec = None
         self.tvec = None
         
-        # Video thread
-        self.video_thread = None
+        # Single long-lived video thread shared by all tabs; started on first
+        # use and kept running across tab switches
+        self.video_thread = VideoThread(self.camera_source, self.charuco_detector, self.board)
+        # (image handler, detection handler) of the tab consuming the live feed
+        self.frame_handlers = None
+        
+        # Pull the newest frame from the video thread at a fixed rate
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.poll_video_frame)
+        self.frame_timer.start(FRAME_POLL_INTERVAL_MS)
+        
+        # Log lines are kept in bounded buffers and flushed to the widgets in batches
+        self._log_buffers = {}
+        self._dirty_logs = set()
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_logs)
+        self.log_timer.start(LOG_FLUSH_INTERVAL_MS)
         
         self.init_ui()
         self.load_saved_calibration()
+        
+        if not opencv_version_ok():
+            min_version = '.'.join(map(str, MIN_OPENCV_VERSION))
+            self.log_message(self.calib_log,
+                           f"⚠ OpenCV {cv2.__version__} is older than {min_version}; "
+                           f"ChArUco detection will be much slower. Upgrade opencv-contrib-python.")
 
     def resource_path(self, path):
         """Get the absolute path to resource, works in PyInstaller exe"""
@@ -87,25 +128,47 @@ class ChArUcoCalibrationGUI(QMainWindow):
             return os.path.join(sys._MEIPASS, path)
         return os.path.join(os.path.abspath("."), path)
 
+    def attach_camera(self, mode, update_image, update_detection):
+        """
+        Route the live feed to a tab, starting the camera on first use.
+        
+        Args:
+            mode (str): Video thread mode ('calib', 'extrin' or 'measure')
+            update_image (callable): Slot receiving the display QImage
+            update_detection (callable): Slot receiving the detection info dict
+        """
+        self.video_thread.set_mode(mode)
+        self.video_thread.set_draw_overlay(True)
+        self.frame_handlers = (update_image, update_detection)
+        if not self.video_thread.isRunning():
+            self.video_thread.start()
+
     def stop_active_camera(self):
         """Stop any active camera thread safely"""
-        if self.video_thread and self.video_thread.isRunning():
-            try:
-                self.video_thread.change_pixmap.disconnect()
-            except TypeError:
-                pass
-            try:
-                self.video_thread.detection_info.disconnect()
-            except TypeError:
-                pass
-
+        self.frame_handlers = None
+        if self.video_thread.isRunning():
             self.video_thread.stop()
-            self.video_thread = None
+
+    def poll_video_frame(self):
+        """Hand the newest captured frame to the active tab (latest frame wins)"""
+        if self.frame_handlers is None:
+            return
+        
+        latest = self.video_thread.take_latest()
+        if latest is None:
+            return
+        
+        image, info = latest
+        update_image, update_detection = self.frame_handlers
+        update_detection(info)
+        update_image(image)
 
     def init_detectors(self):
         """Initialize ArUco and ChArUco detectors"""
         try:
             self.charuco_detector, self.aruco_detector, self.board, self.aruco_dict = get_detectors()
+            # Separate instance for GUI-thread detections while the video thread runs
+            self.capture_detector = create_detectors()[0]
         except Exception as e:
             QMessageBox.critical(self, "Initialization Error", 
                                f"Failed to initialize detectors: {str(e)}")
@@ -136,24 +199,36 @@ class ChArUcoCalibrationGUI(QMainWindow):
         self.statusBar().showMessage("Ready")
 
     def on_tab_changed(self, index):
-        """Stop camera when switching tabs"""
-        self.stop_active_camera()
+        """
+        Detach the live feed when switching tabs.
+        
+        The camera stays open (so Start on the new tab is instant) but the video
+        thread goes idle: no detection and no display image until a tab attaches.
+        """
+        self.frame_handlers = None
+        self.video_thread.detect_enabled = False
+        self.video_thread.set_draw_overlay(False)
+        camera_open = self.video_thread.isRunning()
 
-        # Reset UI state for all tabs
+        # Reset UI state for all tabs; Stop stays available to release the camera
         self.calib_start_btn.setEnabled(True)
         self.calib_capture_btn.setEnabled(False)
-        self.calib_stop_btn.setEnabled(False)
+        self.calib_stop_btn.setEnabled(camera_open)
 
         self.extrin_start_btn.setEnabled(True)
         self.extrin_capture_btn.setEnabled(False)
-        self.extrin_stop_btn.setEnabled(False)
+        self.extrin_stop_btn.setEnabled(camera_open)
 
         self.measure_start_btn.setEnabled(True)
         self.measure_freeze_btn.setEnabled(False)
         self.measure_reset_btn.setEnabled(False)
-        self.measure_stop_btn.setEnabled(False)
+        self.measure_stop_btn.setEnabled(camera_open)
 
-        self.statusBar().showMessage("Camera stopped (tab changed)")
+        if camera_open:
+            self.statusBar().showMessage("Camera open but idle (tab changed) - "
+                                         "Start resumes the feed, Stop releases the camera")
+        else:
+            self.statusBar().showMessage("Ready")
         
     def create_calibration_tab(self):
         """Create the calibration tab"""
@@ -176,12 +251,9 @@ class ChArUcoCalibrationGUI(QMainWindow):
         layout.addWidget(instructions)
         
         # Video display
-        self.calib_video_label = QLabel()
-        self.calib_video_label.setMinimumSize(640, 480)
-        self.calib_video_label.setStyleSheet("border: 2px solid #333; background-color: #000;")
-        self.calib_video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.calib_video_label.setText("Camera feed will appear here")
-        layout.addWidget(self.calib_video_label)
+        self.calib_video_view = VideoWidget("Camera feed will appear here")
+        self.calib_video_view.setMinimumSize(640, 480)
+        layout.addWidget(self.calib_video_view)
         
         # Info panel
         info_layout = QHBoxLayout()
@@ -244,12 +316,9 @@ class ChArUcoCalibrationGUI(QMainWindow):
         layout.addWidget(instructions)
         
         # Video display
-        self.extrin_video_label = QLabel()
-        self.extrin_video_label.setMinimumSize(640, 480)
-        self.extrin_video_label.setStyleSheet("border: 2px solid #333; background-color: #000;")
-        self.extrin_video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.extrin_video_label.setText("Camera feed will appear here")
-        layout.addWidget(self.extrin_video_label)
+        self.extrin_video_view = VideoWidget("Camera feed will appear here")
+        self.extrin_video_view.setMinimumSize(640, 480)
+        layout.addWidget(self.extrin_video_view)
         
         # Info
         self.extrin_status_label = QLabel("Status: Not calibrated")
@@ -301,13 +370,11 @@ class ChArUcoCalibrationGUI(QMainWindow):
         layout.addWidget(instructions)
         
         # Video display
-        self.measure_video_label = QLabel()
-        self.measure_video_label.setMinimumSize(640, 480)
-        self.measure_video_label.setStyleSheet("border: 2px solid #333; background-color: #000;")
-        self.measure_video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.measure_video_label.setText("Camera feed will appear here")
-        self.measure_video_label.mousePressEvent = self.measurement_click
-        layout.addWidget(self.measure_video_label)
+        self.measure_video_view = VideoWidget("Camera feed will appear here")
+        self.measure_video_view.setMinimumSize(640, 480)
+        self.measure_video_view.resized.connect(self.update_click_mapping)
+        self.measure_video_view.mousePressEvent = self.measurement_click
+        layout.addWidget(self.measure_video_view)
         
         # Control buttons
         btn_layout = QHBoxLayout()
@@ -343,13 +410,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
     def start_calibration_camera(self):
         """Start camera for calibration"""
         try:
-            if self.video_thread and self.video_thread.isRunning():
-                self.stop_calibration_camera()
-            
-            self.video_thread = VideoThread(self.camera_source, self.charuco_detector, self.board)
-            self.video_thread.change_pixmap.connect(self.update_calib_image)
-            self.video_thread.detection_info.connect(self.update_calib_detection)
-            self.video_thread.start()
+            self.attach_camera('calib', self.update_calib_image, self.update_calib_detection)
             
             self.calib_start_btn.setEnabled(False)
             self.calib_capture_btn.setEnabled(True)
@@ -361,11 +422,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
     
     def update_calib_image(self, image):
         """Update calibration video display"""
-        pixmap = QPixmap.fromImage(image)
-        scaled = pixmap.scaled(self.calib_video_label.size(), 
-                              Qt.AspectRatioMode.KeepAspectRatio,
-                              Qt.TransformationMode.SmoothTransformation)
-        self.calib_video_label.setPixmap(scaled)
+        self.calib_video_view.set_frame(image)
     
     def update_calib_detection(self, info):
         """Update detection information"""
@@ -376,9 +433,47 @@ class ChArUcoCalibrationGUI(QMainWindow):
             frame = info['frame']
             self.image_size = (frame.shape[1], frame.shape[0])
     
+    def full_res_corners(self, info):
+        """Map ChArUco corners detected on the downscaled live frame back to camera resolution"""
+        corners = info['charuco_corners']
+        if corners is None:
+            return corners
+        scale = info.get('scale', 1.0)
+        if scale != 1.0:
+            corners = corners / np.float32(scale)
+        # Corners found below raw resolution are only accurate to ~1/detect_scale
+        # px, even when the preview itself is not downscaled; refine on the raw frame
+        if info.get('detect_scale', scale) < 1.0:
+            corners = refine_corners(info['frame'], corners)
+        return corners
+    
+    def fresh_detection(self, info):
+        """
+        Return detection info whose corners belong to info's frame.
+        
+        Live detection info carries the raw frame its corners were detected on.
+        Only when the thread has no detection for the current mode yet is the
+        frame re-detected synchronously before it is captured.
+        """
+        if info.get('fresh', True) or 'frame' not in info:
+            return info
+        
+        charuco_corners, charuco_ids, _, _ = detect_charuco(
+            self.capture_detector, info['frame'], self.video_thread.invert_colors)
+        return {
+            'corners_detected': len(charuco_ids) if charuco_ids is not None else 0,
+            'charuco_corners': charuco_corners,
+            'charuco_ids': charuco_ids,
+            'scale': 1.0,
+            'detect_scale': 1.0,
+            'fresh': True,
+            'frame': info['frame']
+        }
+    
     def capture_calibration_frame(self):
         """Capture current frame for calibration"""
         try:
+            self.current_detection = self.fresh_detection(self.current_detection)
             if self.current_detection.get('corners_detected', 0) < MIN_CHARUCO_CORNERS:
                 QMessageBox.warning(self, "Insufficient Corners", 
                                   f"Need at least {MIN_CHARUCO_CORNERS} corners. Current: {self.current_detection.get('corners_detected', 0)}")
@@ -386,7 +481,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
             
             # Use intrinsic calibration module
             frame_count = self.intrinsic.add_frame(
-                self.current_detection['charuco_corners'],
+                self.full_res_corners(self.current_detection),
                 self.current_detection['charuco_ids'],
                 self.image_size
             )
@@ -413,7 +508,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
             self.calib_calibrate_btn.setEnabled(False)
             self.log_message(self.calib_log, "Running calibration... Please wait.")
             
-            # Run calibration in background thread using module
+            # Run calibration in a background process using module
             self.calib_worker = self.intrinsic.run_calibration(self.board)
             self.calib_worker.progress.connect(lambda msg: self.log_message(self.calib_log, msg))
             self.calib_worker.finished.connect(self.calibration_finished)
@@ -429,6 +524,8 @@ class ChArUcoCalibrationGUI(QMainWindow):
             try:
                 # Save using intrinsic module
                 filepath = self.intrinsic.save_calibration(data)
+                # The mtime key can miss a rewrite on coarse-timestamp filesystems
+                Measurement.invalidate_calibration_cache()
                 
                 self.log_message(self.calib_log, f"✓ {message}")
                 self.log_message(self.calib_log, f"✓ Saved to {filepath}")
@@ -447,15 +544,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
     
     def stop_calibration_camera(self):
         """Stop calibration camera"""
-        if self.video_thread:
-            try:
-                self.video_thread.change_pixmap.disconnect()
-                self.video_thread.detection_info.disconnect()
-            except TypeError:
-                pass
-
-            self.video_thread.stop()
-            self.video_thread = None
+        self.stop_active_camera()
 
         self.calib_start_btn.setEnabled(True)
         self.calib_capture_btn.setEnabled(False)
@@ -472,17 +561,11 @@ class ChArUcoCalibrationGUI(QMainWindow):
                                   "Complete intrinsics calibration first!")
                 return
             
-            if self.video_thread and self.video_thread.isRunning():
-                self.stop_extrinsics_camera()
-            
             # Load intrinsics for extrinsic module
             self.camera_matrix, self.dist_coeffs = self.extrinsic.load_intrinsics()
             self.extrinsic.set_intrinsics(self.camera_matrix, self.dist_coeffs)
             
-            self.video_thread = VideoThread(self.camera_source, self.charuco_detector, self.board)
-            self.video_thread.change_pixmap.connect(self.update_extrin_image)
-            self.video_thread.detection_info.connect(self.update_extrin_detection)
-            self.video_thread.start()
+            self.attach_camera('extrin', self.update_extrin_image, self.update_extrin_detection)
             
             self.extrin_start_btn.setEnabled(False)
             self.extrin_capture_btn.setEnabled(True)
@@ -494,11 +577,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
     
     def update_extrin_image(self, image):
         """Update extrinsics video display"""
-        pixmap = QPixmap.fromImage(image)
-        scaled = pixmap.scaled(self.extrin_video_label.size(),
-                              Qt.AspectRatioMode.KeepAspectRatio,
-                              Qt.TransformationMode.SmoothTransformation)
-        self.extrin_video_label.setPixmap(scaled)
+        self.extrin_video_view.set_frame(image)
     
     def update_extrin_detection(self, info):
         """Update extrinsics detection info"""
@@ -508,6 +587,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
     def capture_extrinsics(self):
         """Capture and compute extrinsics"""
         try:
+            self.current_detection = self.fresh_detection(self.current_detection)
             if self.current_detection.get('corners_detected', 0) < MIN_CHARUCO_CORNERS:
                 QMessageBox.warning(self, "Insufficient Corners",
                                   f"Need at least {MIN_CHARUCO_CORNERS} ChArUco corners. Current: {self.current_detection.get('corners_detected', 0)}")
@@ -515,7 +595,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
             
             # Use extrinsic module to capture pose
             success, message, rvec, tvec = self.extrinsic.capture_pose(
-                self.current_detection['charuco_corners'],
+                self.full_res_corners(self.current_detection),
                 self.current_detection['charuco_ids'],
                 self.board
             )
@@ -523,6 +603,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
             if success:
                 # Save extrinsics
                 filepath = self.extrinsic.save_extrinsics(rvec, tvec)
+                Measurement.invalidate_calibration_cache()
                 
                 self.log_message(self.extrin_log, f"✓ {message}")
                 self.log_message(self.extrin_log, f"✓ Saved to {filepath}")
@@ -541,14 +622,7 @@ class ChArUcoCalibrationGUI(QMainWindow):
     
     def stop_extrinsics_camera(self):
         """Stop extrinsics camera"""
-        if self.video_thread:
-            try:
-                self.video_thread.change_pixmap.disconnect()
-                self.video_thread.detection_info.disconnect()
-            except TypeError:
-                pass
-            self.video_thread.stop()
-            self.video_thread = None
+        self.stop_active_camera()
         
         self.extrin_start_btn.setEnabled(True)
         self.extrin_capture_btn.setEnabled(False)
@@ -565,24 +639,23 @@ class ChArUcoCalibrationGUI(QMainWindow):
                                   "Complete both intrinsics and extrinsics calibration first!")
                 return
             
-            if self.video_thread and self.video_thread.isRunning():
-                self.stop_measurement()
-            
             # Set calibration data in measurement module
             self.measurement.set_calibration(
                 self.camera_matrix, self.dist_coeffs,
                 self.rvec, self.tvec
             )
+            self.video_thread.set_undistortion(self.measurement)
             
-            self.video_thread = VideoThread(self.camera_source, self.charuco_detector, self.board)
-            self.video_thread.change_pixmap.connect(self.update_measure_image_undistorted)
-            self.video_thread.detection_info.connect(self.store_measurement_frame)
-            self.video_thread.start()
+            self.attach_camera('measure', self.update_measure_image_undistorted,
+                               self.store_measurement_frame)
             
             self.measure_start_btn.setEnabled(False)
             self.measure_freeze_btn.setEnabled(True)
             self.measure_stop_btn.setEnabled(True)
             self.frozen_frame = None
+            self.frozen_frame_bgr = None
+            self._preview_points = None
+            self._click_scale = None
             self.click_points = []
             self.current_measure_frame = None
             
@@ -592,55 +665,43 @@ class ChArUcoCalibrationGUI(QMainWindow):
             QMessageBox.critical(self, "Measurement Error", f"Failed to start: {str(e)}")
     
     def store_measurement_frame(self, info):
-        """Store the current raw frame for undistortion"""
+        """Store the current raw frame for freezing"""
         if 'frame' in info:
             self.current_measure_frame = info['frame']
     
     def update_measure_image_undistorted(self, image):
-        """Update measurement video display with undistorted feed"""
-        if self.frozen_frame is None and self.current_measure_frame is not None:
-            # Undistort using measurement module
-            undistorted = self.measurement.undistort_frame(self.current_measure_frame)
-            
-            # Add text overlay
-            cv2.putText(undistorted, "Undistorted Feed", (20, 40),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3)
-            
-            # Convert to Qt format
-            rgb_image = cv2.cvtColor(undistorted, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            
-            pixmap = QPixmap.fromImage(qt_image)
-            
-            scaled = pixmap.scaled(self.measure_video_label.size(),
-                                  Qt.AspectRatioMode.KeepAspectRatio,
-                                  Qt.TransformationMode.SmoothTransformation)
-            self.measure_video_label.setPixmap(scaled)
+        """Update measurement video display with the feed undistorted by the video thread"""
+        if self.frozen_frame is None:
+            self.measure_video_view.set_frame(image)
     
     def freeze_frame(self):
         """Freeze current frame for measurement"""
-        if self.video_thread and self.video_thread.isRunning():
+        if self.frame_handlers is not None and self.video_thread.isRunning():
             if self.current_measure_frame is not None:
                 # Store RAW (distorted) frame - image_to_plane needs distorted pixel coords
                 self.frozen_frame_raw = self.current_measure_frame.copy()
                 
                 # Create undistorted version for display only
                 undistorted = self.measurement.undistort_frame(self.current_measure_frame)
+                # Keep a private BGR copy (undistort_frame reuses its buffer) for overlays
+                self.frozen_frame_bgr = undistorted.copy()
+                self._preview_points = None
                 
-                rgb_image = cv2.cvtColor(undistorted, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_image.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-                self.frozen_frame = QPixmap.fromImage(qt_image)
+                # Display wraps the private copy directly (no pixmap upload)
+                self.frozen_frame = ndarray_to_qimage(self.frozen_frame_bgr)
             else:
-                self.frozen_frame = self.measure_video_label.pixmap()
+                # Deep copy: the shown image lives in a buffer the video thread reuses
+                current = self.measure_video_view.frame()
+                self.frozen_frame = current.copy() if current is not None else None
                 self.frozen_frame_raw = None
+                self.frozen_frame_bgr = None
 
-            self.video_thread.stop()
-            self.video_thread = None
+            # Stop routing frames here; the camera stays open for the next start
+            self.frame_handlers = None
+            self.video_thread.set_draw_overlay(False)
 
+            self.measure_video_view.set_frame(self.frozen_frame)
+            self.update_click_mapping()
             self.click_points = []
             self.measurement.reset_points()
             self.measure_freeze_btn.setEnabled(False)
@@ -652,24 +713,12 @@ class ChArUcoCalibrationGUI(QMainWindow):
         if self.frozen_frame is None:
             return
         
-        if len(self.click_points) >= 2:
+        if len(self.click_points) >= 2 or self._click_scale is None:
             return
         
-        # Get click position relative to actual image
-        label_size = self.measure_video_label.size()
-        pixmap_size = self.frozen_frame.size()
-        
-        # Calculate scaling and offset
-        scale_w = pixmap_size.width() / label_size.width()
-        scale_h = pixmap_size.height() / label_size.height()
-        scale = max(scale_w, scale_h)
-        
-        offset_x = (label_size.width() - pixmap_size.width() / scale) / 2
-        offset_y = (label_size.height() - pixmap_size.height() / scale) / 2
-        
         # Convert click to image coordinates
-        img_x = int((event.pos().x() - offset_x) * scale)
-        img_y = int((event.pos().y() - offset_y) * scale)
+        img_x = int((event.pos().x() - self._click_off_x) * self._click_scale)
+        img_y = int((event.pos().y() - self._click_off_y) * self._click_scale)
         
         # Store point in both UI and measurement module
         self.click_points.append((img_x, img_y))
@@ -682,46 +731,50 @@ class ChArUcoCalibrationGUI(QMainWindow):
         if len(self.click_points) == 2:
             self.compute_distance()
     
-    def draw_measurement_points(self):
-        """Draw clicked points on frozen frame"""
-        if self.frozen_frame is None:
+    def update_click_mapping(self):
+        """Precompute the view -> frozen image scale and offsets used by measurement_click"""
+        if self.frozen_frame is None or self.frozen_frame.isNull():
+            self._click_scale = None
             return
         
-        # Convert pixmap to image for drawing
-        image = self.frozen_frame.toImage()
-        
-        # Create a copy for drawing
-        temp_pixmap = QPixmap.fromImage(image)
-        painter = temp_pixmap.toImage()
-        
-        # Convert to cv2 format for easier drawing
-        width = painter.width()
-        height = painter.height()
-        ptr = painter.bits()
-        ptr.setsize(height * width * 4)
-        arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
-        frame = cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
-        
-        # Draw points and line
-        for i, (x, y) in enumerate(self.click_points):
-            cv2.circle(frame, (x, y), 6, (0, 0, 255), -1)
-            cv2.putText(frame, str(i+1), (x+10, y-10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        # Letterbox the view draws the frozen frame into
+        target = self.measure_video_view.frame_rect()
+        if target.isEmpty():
+            self._click_scale = None
+            return
         
-        if len(self.click_points) == 2:
-            cv2.line(frame, self.click_points[0], self.click_points[1], (255, 0, 0), 2)
+        self._click_scale = self.frozen_frame.width() / target.width()
+        self._click_off_x = target.x()
+        self._click_off_y = target.y()
+    
+    def draw_measurement_points(self):
+        """Draw clicked points on frozen frame"""
+        if self.frozen_frame is None or self.frozen_frame_bgr is None:
+            return
         
-        # Convert back to QPixmap
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
+        points = tuple(self.click_points)
+        if points != self._preview_points:
+            # Draw on a fresh copy of the frozen BGR frame
+            frame = self.frozen_frame_bgr.copy()
+            
+            # Draw points and line
+            if points:
+                pts = np.asarray(points, dtype=np.int32)
+                labels = pts + CLICK_LABEL_OFFSET
+                for i, (pt, label) in enumerate(zip(pts.tolist(), labels.tolist())):
+                    cv2.circle(frame, pt, 6, (0, 0, 255), -1)
+                    cv2.putText(frame, str(i+1), label,
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                
+                if len(points) == 2:
+                    cv2.polylines(frame, [pts.reshape(-1, 1, 2)], False, (255, 0, 0), 2)
+            
+            # Qt reads OpenCV's BGR byte order directly
+            self._preview_image = ndarray_to_qimage(frame)
+            self._preview_points = points
         
-        scaled = pixmap.scaled(self.measure_video_label.size(),
-                              Qt.AspectRatioMode.KeepAspectRatio,
-                              Qt.TransformationMode.SmoothTransformation)
-        self.measure_video_label.setPixmap(scaled)
+        # The view scales on the GPU
+        self.measure_video_view.set_frame(self._preview_image)
     
     def compute_distance(self):
         """Compute distance between two clicked points"""
@@ -738,36 +791,27 @@ class ChArUcoCalibrationGUI(QMainWindow):
             self.log_message(self.measure_log, 
                            f"Distance: {dist_m:.6f} m  =  {dist_cm:.2f} cm  =  {dist_mm:.1f} mm")
             
-            # Draw distance on image
-            frame = self.frozen_frame.toImage()
-            width = frame.width()
-            height = frame.height()
-            ptr = frame.bits()
-            ptr.setsize(height * width * 4)
-            arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
-            img = cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
+            # Draw distance on a copy of the frozen BGR frame
+            if self.frozen_frame_bgr is None:
+                return
+            img = self.frozen_frame_bgr.copy()
+            
+            # Draw line and text; label and midpoint positions come from one array
+            pts = np.asarray(self.click_points, dtype=np.int32)
+            labels = pts + CLICK_LABEL_OFFSET
+            mid_x, mid_y = pts.sum(axis=0) // 2
             
-            # Draw line and text
-            cv2.line(img, self.click_points[0], self.click_points[1], (255, 0, 0), 3)
-            for i, (x, y) in enumerate(self.click_points):
-                cv2.circle(img, (x, y), 8, (0, 0, 255), -1)
-                cv2.putText(img, str(i+1), (x+10, y-10),
+            cv2.polylines(img, [pts.reshape(-1, 1, 2)], False, (255, 0, 0), 3)
+            for i, (pt, label) in enumerate(zip(pts.tolist(), labels.tolist())):
+                cv2.circle(img, pt, 8, (0, 0, 255), -1)
+                cv2.putText(img, str(i+1), label,
                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
             
-            mid_x = (self.click_points[0][0] + self.click_points[1][0]) // 2
-            mid_y = (self.click_points[0][1] + self.click_points[1][1]) // 2
-            cv2.putText(img, f"{dist_cm:.2f} cm", (mid_x, mid_y),
+            cv2.putText(img, f"{dist_cm:.2f} cm", (int(mid_x), int(mid_y)),
                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 0), 3)
             
-            # Update display
-            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            qt_image = QImage(rgb.data, w, h, ch * w, QImage.Format.Format_RGB888)
-            pixmap = QPixmap.fromImage(qt_image)
-            scaled = pixmap.scaled(self.measure_video_label.size(),
-                                  Qt.AspectRatioMode.KeepAspectRatio,
-                                  Qt.TransformationMode.SmoothTransformation)
-            self.measure_video_label.setPixmap(scaled)
+            # Update display (Qt reads the BGR buffer directly and keeps it alive)
+            self.measure_video_view.set_frame(ndarray_to_qimage(img), smooth=True)
             
         except Exception as e:
             self.log_message(self.measure_log, f"✗ Error computing distance: {str(e)}")
@@ -777,29 +821,15 @@ class ChArUcoCalibrationGUI(QMainWindow):
         """Reset measurement points"""
         self.click_points = []
         self.measurement.reset_points()
-        if self.frozen_frame:
-            scaled = self.frozen_frame.scaled(self.measure_video_label.size(),
-                                             Qt.AspectRatioMode.KeepAspectRatio,
-                                             Qt.TransformationMode.SmoothTransformation)
-            self.measure_video_label.setPixmap(scaled)
+        if self.frozen_frame is not None:
+            self.measure_video_view.set_frame(self.frozen_frame)
         self.log_message(self.measure_log, "Points reset - click two new points")
     
     def stop_measurement(self):
         """Stop measurement mode"""
         try:
-            if self.video_thread:
-                try:
-                    self.video_thread.change_pixmap.disconnect()
-                except:
-                    pass
-                try:
-                    self.video_thread.detection_info.disconnect()
-                except:
-                    pass
-                self.video_thread.stop()
-                self.video_thread = None
+            self.stop_active_camera()
         except:
-            self.video_thread = None
             self.log_message(self.measure_log, "camera stopping failed")
         
         self.measure_start_btn.setEnabled(True)
@@ -807,6 +837,9 @@ class ChArUcoCalibrationGUI(QMainWindow):
         self.measure_reset_btn.setEnabled(False)
         self.measure_stop_btn.setEnabled(False)
         self.frozen_frame = None
+        self.frozen_frame_bgr = None
+        self._preview_points = None
+        self._click_scale = None
         self.click_points = []
         self.current_measure_frame = None
         self.measurement.reset_points()
@@ -817,38 +850,52 @@ class ChArUcoCalibrationGUI(QMainWindow):
     def load_saved_calibration(self):
         """Load saved calibration data"""
         try:
-            if os.path.exists(CALIB_FILE):
+            # Only the final outcome is shown, so update the status bar once
+            loaded = False
+            if not os.path.exists(CALIB_FILE):
+                status = "⚠ No intrinsics calibration found"
+            elif not os.path.exists(EXTRINSICS_FILE):
                 self.camera_matrix, self.dist_coeffs = IntrinsicCalibration.load_calibration()
-                self.statusBar().showMessage("✓ Intrinsics loaded")
+                status = "⚠ Extrinsics not found - complete extrinsics calibration"
             else:
-                self.statusBar().showMessage("⚠ No intrinsics calibration found")
-                return False
-            
-            if os.path.exists(EXTRINSICS_FILE):
-                self.rvec, self.tvec = ExtrinsicCalibration.load_extrinsics()
-                self.statusBar().showMessage("✓ Intrinsics and Extrinsics loaded")
-                return True
-            else:
-                self.statusBar().showMessage("⚠ Extrinsics not found - complete extrinsics calibration")
-                return False
+                # Cached while the files are unchanged (reloaded on every measurement start)
+                (self.camera_matrix, self.dist_coeffs,
+                 self.rvec, self.tvec) = Measurement.load_calibrations()
+                status = "✓ Intrinsics and Extrinsics loaded"
+                loaded = True
+            
+            self.statusBar().showMessage(status)
+            return loaded
                 
         except Exception as e:
             QMessageBox.warning(self, "Load Error", f"Error loading calibration: {str(e)}")
             return False
     
     def log_message(self, log_widget, message):
-        """Add message to log widget"""
-        log_widget.append(message)
-        log_widget.verticalScrollBar().setValue(log_widget.verticalScrollBar().maximum())
+        """Queue message for log widget (shown on the next flush_logs tick)"""
+        if log_widget not in self._log_buffers:
+            self._log_buffers[log_widget] = deque(maxlen=LOG_MAX_LINES)
+        self._log_buffers[log_widget].append(message)
+        self._dirty_logs.add(log_widget)
+    
+    def flush_logs(self):
+        """Push buffered log lines to the widgets that changed since the last tick"""
+        for log_widget in self._dirty_logs:
+            log_widget.setPlainText("\n".join(self._log_buffers[log_widget]))
+            log_widget.verticalScrollBar().setValue(log_widget.verticalScrollBar().maximum())
+        self._dirty_logs.clear()
     
     def closeEvent(self, event):
         """Handle window close"""
-        if self.video_thread and self.video_thread.isRunning():
-            self.video_thread.stop()
+        if self.calib_worker is not None:
+            self.calib_worker.cancel()
+        self.stop_active_camera()
         event.accept()
 
 
 def main():
+    # Calibration runs in a child process; required for frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
@@ -7,8 +7,19 @@ Supports environment variable override for custom camera sources.
 
 import platform
 import os
+import re
+import glob
+import time
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 
+# Appended to user GStreamer pipelines so the sink keeps only the newest frame
+GST_LATEST_FRAME_SINK = "appsink drop=true max-buffers=1 sync=false"
+
+# get_available_cameras() results are reused for this long
+CAMERA_CACHE_TTL_S = 10.0
+_cached_cameras = {}  # max_test -> (timestamp, camera indices)
+
 
 def get_camera_source():
     """
@@ -94,29 +105,80 @@ def open_camera(cam_source=None, backend=None):
     if not cap.isOpened():
         raise RuntimeError(f"Cannot open camera {cam_source} with backend {backend}")
     
+    # Keep a single frame in the driver queue so reads are not ~4 frames stale
+    # (backends that don't support it silently ignore the request)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
+    return cap
+
+
+def open_gstreamer_camera(pipeline):
+    """
+    Open a GStreamer pipeline that always delivers the newest frame.
+    
+    Args:
+        pipeline (str): GStreamer source pipeline without a sink,
+                        e.g. "v4l2src device=/dev/video0 ! videoconvert"
+    
+    Returns:
+        cv2.VideoCapture: Opened camera capture object
+    
+    Raises:
+        RuntimeError: If the pipeline cannot be opened
+    """
+    pipeline = f"{pipeline.rstrip().rstrip('!').rstrip()} ! {GST_LATEST_FRAME_SINK}"
+    cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+    
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open GStreamer pipeline: {pipeline}")
+    
     return cap
 
 
-def get_available_cameras(max_test=10):
+def _probe_camera(index, backend):
+    """Return index if a camera opens at it, else None"""
+    try:
+        cap = cv2.VideoCapture(index, backend)
+        try:
+            return index if cap.isOpened() else None
+        finally:
+            cap.release()
+    except Exception:
+        return None
+
+
+def get_available_cameras(max_test=10, refresh=False):
     """
     Detect available camera indices on the system.
     
+    Opening a camera blocks in the driver (GIL released), so candidates are
+    probed in parallel. On Linux only indices with a /dev/videoN node are
+    probed. Results are cached for CAMERA_CACHE_TTL_S seconds.
+    
     Args:
         max_test (int): Maximum number of camera indices to test
+        refresh (bool): Ignore the cached result and probe again
     
     Returns:
         list: List of available camera indices
     """
-    available_cameras = []
+    cached = _cached_cameras.get(max_test)
+    if cached is not None and not refresh and time.monotonic() - cached[0] < CAMERA_CACHE_TTL_S:
+        return list(cached[1])
+    
+    if platform.system() == "Linux":
+        candidates = sorted(int(m.group(1)) for m in
+                            (re.fullmatch(r"/dev/video(\d+)", path) for path in glob.glob("/dev/video*"))
+                            if m and int(m.group(1)) < max_test)
+    else:
+        candidates = list(range(max_test))
+    
     backend = get_camera_backend()
+    available_cameras = []
+    if candidates:
+        with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            results = executor.map(lambda i: _probe_camera(i, backend), candidates)
+            available_cameras = [i for i in results if i is not None]
     
-    for i in range(max_test):
-        try:
-            cap = cv2.VideoCapture(i, backend)
-            if cap.isOpened():
-                available_cameras.append(i)
-                cap.release()
-        except:
-            continue
-    
-    return available_cameras
+    _cached_cameras[max_test] = (time.monotonic(), available_cameras)
+    return list(available_cameras)
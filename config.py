@@ -4,6 +4,7 @@ Configuration Module for ChArUco Calibration Application
 Contains all configuration constants and detector initialization functions.
 """
 
+import os
 import cv2
 
 # ==================== FILE PATHS ====================
@@ -18,48 +19,121 @@ SQUARE_LENGTH = 0.010  # meters (adjust as needed)
 MARKER_LENGTH = 0.008   # meters (adjust as needed)
 MIN_CHARUCO_CORNERS = 4
 
+# OpenCV 4.6-4.9 has a 10-100x ChArUco detection slowdown fixed in 4.10
+MIN_OPENCV_VERSION = (4, 10)
+
 
 
 # color inversion
 INVERT_COLORS = True 
 
+# ==================== DISPLAY PARAMETERS ====================
+FRAME_POLL_INTERVAL_MS = 33  # GUI refresh interval for the live feed (~30 FPS)
+PROCESSING_SIZE = (1280, 720)  # max (width, height) for live detection and display
+DETECT_EVERY = 2  # submit every Nth frame to the live ChArUco detection thread
+DETECTION_SCALE = 0.5  # live detection runs on the preview frame resized by this factor
+LOG_FLUSH_INTERVAL_MS = 100  # how often buffered log lines are pushed to the log widgets
+LOG_MAX_LINES = 200  # lines kept per log widget
+
+# ==================== PERFORMANCE ====================
+OPENCV_THREADS = None  # OpenCV worker threads; None = one per physical core
+USE_OPENCL = True  # allow OpenCV's T-API (UMat) to offload undistortion to an OpenCL device
+CAMERA_FOURCC = "MJPG"  # capture format requested from the camera; None keeps the driver default
+CAMERA_FPS = 30  # capture rate requested from the camera; None keeps the driver default
+
 # ==================== DETECTOR INITIALIZATION ====================
 
-def get_aruco_board():
+def opencv_version_ok():
     """
-    Create and return the ChArUco board object.
+    Check that the installed OpenCV meets MIN_OPENCV_VERSION.
     
     Returns:
-        cv2.aruco.CharucoBoard: Configured ChArUco board
+        bool: True if cv2.__version__ is at least MIN_OPENCV_VERSION
     """
-    aruco_dict = cv2.aruco.getPredefinedDictionary(DICT_TYPE)
-    board = cv2.aruco.CharucoBoard(
-        (SQUARES_X, SQUARES_Y), 
-        SQUARE_LENGTH, 
-        MARKER_LENGTH, 
-        aruco_dict
-    )
-    return board
+    try:
+        version = tuple(int(part) for part in cv2.__version__.split('.')[:2])
+    except ValueError:
+        return True  # unparseable (e.g. custom build) - don't warn
+    return version >= MIN_OPENCV_VERSION
 
 
-def get_detectors():
+def physical_core_count():
     """
-    Initialize and return ArUco and ChArUco detectors.
+    Count physical CPU cores (SMT siblings excluded).
     
-    Returns:
-        tuple: (charuco_detector, aruco_detector, board, aruco_dict)
+    Uses psutil when installed, otherwise assumes two hardware threads per core.
     
-    Raises:
-        RuntimeError: If detector initialization fails
+    Returns:
+        int: Number of physical cores (at least 1)
     """
     try:
+        import psutil
+        count = psutil.cpu_count(logical=False)
+    except ImportError:
+        count = None
+    if not count:
+        count = (os.cpu_count() or 2) // 2
+    return max(1, count)
+
+
+def configure_opencv_threads():
+    """
+    Pin OpenCV's thread pool to OPENCV_THREADS (default: physical core count).
+    
+    OpenCV otherwise uses every logical core, and oversubscribing SMT siblings
+    slows remap and calibrateCameraCharuco. Also applies USE_OPENCL, since
+    OpenCV's own default depends on the build and environment.
+    
+    Returns:
+        int: Number of threads OpenCV was set to
+    """
+    threads = OPENCV_THREADS or physical_core_count()
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(threads)
+    cv2.ocl.setUseOpenCL(USE_OPENCL)
+    return threads
+
+
+# Built on first use; the board and detectors never change at runtime
+_BOARD = None
+_DETECTORS = None
+
+
+def get_aruco_board():
+    """
+    Return the shared ChArUco board object.
+    
+    Returns:
+        cv2.aruco.CharucoBoard: Configured ChArUco board
+    """
+    global _BOARD
+    if _BOARD is None:
         aruco_dict = cv2.aruco.getPredefinedDictionary(DICT_TYPE)
-        board = cv2.aruco.CharucoBoard(
+        _BOARD = cv2.aruco.CharucoBoard(
             (SQUARES_X, SQUARES_Y), 
             SQUARE_LENGTH, 
             MARKER_LENGTH, 
             aruco_dict
         )
+    return _BOARD
+
+
+def create_detectors():
+    """
+    Build a new set of ArUco and ChArUco detectors for the shared board.
+    
+    Use this instead of get_detectors() when a detector must not be shared
+    with another thread.
+    
+    Returns:
+        tuple: (charuco_detector, aruco_detector, board, aruco_dict)
+    
+    Raises:
+        RuntimeError: If detector initialization fails
+    """
+    try:
+        board = get_aruco_board()
+        aruco_dict = board.getDictionary()
         
         params = cv2.aruco.DetectorParameters()
         charuco_params = cv2.aruco.CharucoParameters()
@@ -71,3 +145,19 @@ def get_detectors():
         
     except Exception as e:
         raise RuntimeError(f"Failed to initialize detectors: {str(e)}")
+
+
+def get_detectors():
+    """
+    Return the shared ArUco and ChArUco detectors, building them on first call.
+    
+    Returns:
+        tuple: (charuco_detector, aruco_detector, board, aruco_dict)
+    
+    Raises:
+        RuntimeError: If detector initialization fails
+    """
+    global _DETECTORS
+    if _DETECTORS is None:
+        _DETECTORS = create_detectors()
+    return _DETECTORS
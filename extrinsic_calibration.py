@@ -7,8 +7,33 @@ Computes rotation and translation vectors.
 
 import cv2
 import numpy as np
-import json
-from config import CALIB_FILE, EXTRINSICS_FILE
+from config import EXTRINSICS_FILE
+from intrinsic_calibration import IntrinsicCalibration, read_json, write_json
+
+# Reused flat int32 id buffer for capture_pose (grown as needed)
+_IDS_SCRATCH = np.empty(0, dtype=np.int32)
+
+
+def _normalize_ids(ids):
+    """
+    Flatten ChArUco ids into a contiguous int32 vector.
+    
+    OpenCV returns ids as (N, 1) or (N,) depending on the version. The result
+    is a view of a module-level scratch buffer, valid until the next call.
+    
+    Args:
+        ids (array-like): Detected ChArUco IDs
+    
+    Returns:
+        np.ndarray: (N,) int32 ids
+    """
+    global _IDS_SCRATCH
+    ids = np.asarray(ids)
+    if _IDS_SCRATCH.size < ids.size:
+        _IDS_SCRATCH = np.empty(ids.size, dtype=np.int32)
+    flat = _IDS_SCRATCH[:ids.size]
+    flat[:] = ids.reshape(-1)
+    return flat
 
 
 class ExtrinsicCalibration:
@@ -26,6 +51,9 @@ class ExtrinsicCalibration:
         self.dist_coeffs = dist_coeffs
         self.rvec = None
         self.tvec = None
+        # Board corner table, fetched once per board instance
+        self._obj_points_cache = None
+        self._obj_points_cache_board = None
     
     def set_intrinsics(self, camera_matrix, dist_coeffs):
         """
@@ -61,19 +89,30 @@ class ExtrinsicCalibration:
         
         try:
             # Get 3D object points for detected corners
-            obj_points = board.getChessboardCorners()
-            obj_pts = np.array([obj_points[id[0]] for id in charuco_ids], dtype=np.float32)
-            img_pts = charuco_corners.reshape(-1, 2).astype(np.float32)
+            if self._obj_points_cache is None or self._obj_points_cache_board is not board:
+                self._obj_points_cache = np.ascontiguousarray(board.getChessboardCorners(),
+                                                              dtype=np.float32)
+                self._obj_points_cache_board = board
+            obj_pts = self._obj_points_cache[_normalize_ids(charuco_ids)]
+            img_pts = np.ascontiguousarray(charuco_corners, dtype=np.float32).reshape(-1, 2)
             
-            # Solve PnP
+            # The board is planar (z = 0), so use the closed-form planar solver
+            # and polish the pose with a few virtual visual servoing steps
             success, rvec, tvec = cv2.solvePnP(
                 obj_pts, img_pts, 
                 self.camera_matrix, 
                 self.dist_coeffs,
-                flags=cv2.SOLVEPNP_ITERATIVE
+                flags=cv2.SOLVEPNP_IPPE
             )
             
             if success:
+                rvec, tvec = cv2.solvePnPRefineVVS(
+                    obj_pts, img_pts,
+                    self.camera_matrix,
+                    self.dist_coeffs,
+                    rvec, tvec
+                )
+                
                 self.rvec = rvec
                 self.tvec = tvec
                 return True, "Extrinsics captured successfully", rvec, tvec
@@ -85,7 +124,7 @@ class ExtrinsicCalibration:
     
     def save_extrinsics(self, rvec=None, tvec=None, filepath=None):
         """
-        Save extrinsic parameters to JSON file.
+        Save extrinsic parameters to a JSON file, or binary arrays for a .npz path.
         
         Args:
             rvec (np.ndarray, optional): Rotation vector. Uses self.rvec if None
@@ -109,13 +148,18 @@ class ExtrinsicCalibration:
         if filepath is None:
             filepath = EXTRINSICS_FILE
         
+        if str(filepath).endswith('.npz'):
+            np.savez_compressed(filepath,
+                                rvec=np.asarray(rvec, dtype=np.float64).reshape(3, 1),
+                                tvec=np.asarray(tvec, dtype=np.float64).reshape(3, 1))
+            return filepath
+        
         extrinsics_data = {
-            'rvec': rvec.flatten().tolist(),
-            'tvec': tvec.flatten().tolist()
+            'rvec': np.asarray(rvec, dtype=np.float64).flatten(),
+            'tvec': np.asarray(tvec, dtype=np.float64).flatten()
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(extrinsics_data, f, indent=2)
+        write_json(filepath, extrinsics_data)
         
         return filepath
     
@@ -133,21 +177,12 @@ class ExtrinsicCalibration:
         Raises:
             FileNotFoundError: If calibration file doesn't exist
         """
-        if filepath is None:
-            filepath = CALIB_FILE
-        
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        camera_matrix = np.array(data['camera_matrix'], dtype=np.float64)
-        dist_coeffs = np.array(data['dist_coeffs'], dtype=np.float64)
-        
-        return camera_matrix, dist_coeffs
+        return IntrinsicCalibration.load_calibration(filepath)
     
     @staticmethod
     def load_extrinsics(filepath=None):
         """
-        Load extrinsic parameters from file.
+        Load extrinsic parameters from a JSON or .npz file.
         
         Args:
             filepath (str, optional): Extrinsics file path. Defaults to EXTRINSICS_FILE
@@ -161,8 +196,11 @@ class ExtrinsicCalibration:
         if filepath is None:
             filepath = EXTRINSICS_FILE
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if str(filepath).endswith('.npz'):
+            with np.load(filepath) as data:
+                return data['rvec'], data['tvec']
+        
+        data = read_json(filepath)
         
         rvec = np.array(data['rvec'], dtype=np.float64).reshape(3, 1)
         tvec = np.array(data['tvec'], dtype=np.float64).reshape(3, 1)
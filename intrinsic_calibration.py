@@ -3,17 +3,208 @@ Intrinsic Calibration Module
 
 Handles camera intrinsic calibration using ChArUco boards.
 Computes camera matrix and distortion coefficients.
+
+The calibration solve runs in a separate process so it neither competes with
+the GUI for the GIL nor can take the GUI down if OpenCV crashes.
 """
 
 import cv2
 import numpy as np
 import json
-from PyQt6.QtCore import QThread, pyqtSignal
-from config import CALIB_FILE
+import multiprocessing
+
+try:
+    import orjson  # optional: faster JSON with native numpy support
+except ImportError:
+    orjson = None
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from config import CALIB_FILE, SQUARES_X, SQUARES_Y, configure_opencv_threads
+
+# How often the GUI checks the calibration process pipe for messages
+RESULT_POLL_INTERVAL_MS = 50
+
+# Frame slots preallocated for captured corners (grown by doubling when full)
+INITIAL_FRAME_CAPACITY = 30
+
+
+def board_to_state(board):
+    """
+    Describe a ChArUco board with picklable values (cv2 boards cannot be pickled).
+    
+    Args:
+        board: ChArUco board instance
+    
+    Returns:
+        dict: Board geometry and dictionary needed by board_from_state()
+    """
+    dictionary = board.getDictionary()
+    return {
+        'size': board.getChessboardSize(),
+        'square_length': board.getSquareLength(),
+        'marker_length': board.getMarkerLength(),
+        'dict_bytes': dictionary.bytesList,
+        'marker_size': dictionary.markerSize,
+        'max_correction_bits': dictionary.maxCorrectionBits,
+        'ids': board.getIds(),
+        'legacy_pattern': board.getLegacyPattern()
+    }
+
+
+def board_from_state(state):
+    """
+    Rebuild a ChArUco board from board_to_state() output.
+    
+    Args:
+        state (dict): Board description
+    
+    Returns:
+        cv2.aruco.CharucoBoard: Equivalent board
+    """
+    dictionary = cv2.aruco.Dictionary(
+        state['dict_bytes'], state['marker_size'], state['max_correction_bits']
+    )
+    board = cv2.aruco.CharucoBoard(
+        state['size'], state['square_length'], state['marker_length'],
+        dictionary, state['ids']
+    )
+    board.setLegacyPattern(state['legacy_pattern'])
+    return board
+
+
+def compute_calibration(corners, ids, board, image_size):
+    """
+    Run the ChArUco intrinsic calibration solve.
+    
+    Args:
+        corners (list): List of detected ChArUco corner arrays
+        ids (list): List of detected ChArUco ID arrays
+        board: ChArUco board instance
+        image_size (tuple): Image dimensions (width, height)
+    
+    Returns:
+        tuple: (success, message, calib_data)
+    """
+    ret, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.aruco.calibrateCameraCharuco(
+        corners, ids, board, image_size, None, None
+    )
+    
+    if not ret or ret > 2.0:  # RMS error threshold
+        return False, "Calibration RMS error too high. Collect better frames.", None
+        
+    calib_data = {
+        'camera_matrix': camera_matrix.tolist(),
+        'dist_coeffs': dist_coeffs.tolist(),
+        'rms': float(ret),
+        'image_size': image_size
+    }
+    
+    return True, f"Calibration completed with RMS error: {ret:.4f}", calib_data
+
+
+def _json_default(obj):
+    """Convert numpy values for the stdlib json fallback"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(filepath, data):
+    """
+    Write data as indented JSON, using orjson when installed.
+    
+    Numpy arrays and scalars in data are serialized directly.
+    
+    Args:
+        filepath (str): Output file path
+        data (dict): Data to save
+    """
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2, default=_json_default)
+
+
+def read_json(filepath):
+    """
+    Read a JSON file, using orjson when installed.
+    
+    Args:
+        filepath (str): Input file path
+    
+    Returns:
+        dict: Parsed data
+    """
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r') as f:
+        return json.load(f)
 
 
-class CalibrationWorker(QThread):
-    """Background thread for running calibration calculations"""
+def save_calibration_npz(filepath, camera_matrix, dist_coeffs, rms, image_size):
+    """
+    Save calibration results as binary arrays (bit-exact, no float parsing on load).
+    
+    Args:
+        filepath (str): Output .npz path
+        camera_matrix (array-like): 3x3 camera intrinsic matrix
+        dist_coeffs (array-like): Distortion coefficients
+        rms (float): Reprojection error
+        image_size (tuple): Image dimensions (width, height)
+    """
+    np.savez_compressed(
+        filepath,
+        camera_matrix=np.asarray(camera_matrix, dtype=np.float64),
+        dist_coeffs=np.asarray(dist_coeffs, dtype=np.float64),
+        rms=np.float64(rms),
+        image_size=np.asarray(image_size, dtype=np.int64)
+    )
+
+
+def load_calibration_npz(filepath):
+    """
+    Load calibration results saved by save_calibration_npz().
+    
+    Args:
+        filepath (str): Input .npz path
+    
+    Returns:
+        dict: camera_matrix, dist_coeffs (np.ndarray), rms (float), image_size (tuple)
+    """
+    with np.load(filepath) as data:
+        return {
+            'camera_matrix': data['camera_matrix'],
+            'dist_coeffs': data['dist_coeffs'],
+            'rms': float(data['rms']),
+            'image_size': tuple(int(v) for v in data['image_size'])
+        }
+
+
+def _calibration_process_main(conn, corners, ids, board_state, image_size):
+    """Calibration process entry point - reports through conn as ('progress', msg) / ('finished', ...)"""
+    try:
+        # Spawned processes start with OpenCV's defaults
+        configure_opencv_threads()
+        conn.send(('progress', "Running calibration algorithm..."))
+        board = board_from_state(board_state)
+        success, message, calib_data = compute_calibration(corners, ids, board, image_size)
+        
+        if success:
+            conn.send(('progress', f"Calibration successful! RMS = {calib_data['rms']:.4f}"))
+        conn.send(('finished', success, message, calib_data))
+        
+    except Exception as e:
+        conn.send(('finished', False, f"Calibration failed: {str(e)}", None))
+    finally:
+        conn.close()
+
+
+class CalibrationWorker(QObject):
+    """Runs calibration calculations in a background process"""
     finished = pyqtSignal(bool, str, object)
     progress = pyqtSignal(str)
     
@@ -32,31 +223,66 @@ class CalibrationWorker(QThread):
         self.ids = ids
         self.board = board
         self.image_size = image_size
+        self.process = None
+        self._conn = None
+        
+        # Pipe handles are not sockets on Windows, so poll instead of QSocketNotifier
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._poll_process)
+        
+    def start(self):
+        """Start the calibration process"""
+        # Always spawn: forking this process would copy the running Qt, video
+        # and detection threads' state into the child (fork is Linux's default)
+        ctx = multiprocessing.get_context('spawn')
+        self._conn, child_conn = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(
+            target=_calibration_process_main,
+            args=(child_conn, self.corners, self.ids, board_to_state(self.board), self.image_size),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()  # the child holds its own copy
+        self._poll_timer.start(RESULT_POLL_INTERVAL_MS)
+    
+    def is_running(self):
+        """Check whether the calibration process is still working"""
+        return self._poll_timer.isActive()
+    
+    def cancel(self):
+        """
+        Terminate a running calibration process.
         
-    def run(self):
-        """Execute calibration algorithm"""
+        No finished signal is emitted for a cancelled calibration.
+        """
+        if not self.is_running():
+            return
+        self._poll_timer.stop()
+        self.process.terminate()
+        self.process.join()
+        self._conn.close()
+    
+    def _poll_process(self):
+        """Forward messages from the calibration process to the Qt signals"""
         try:
-            self.progress.emit("Running calibration algorithm...")
-            ret, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.aruco.calibrateCameraCharuco(
-                self.corners, self.ids, self.board, self.image_size, None, None
-            )
-            
-            if not ret or ret > 2.0:  # RMS error threshold
-                self.finished.emit(False, "Calibration RMS error too high. Collect better frames.", None)
-                return
-                
-            calib_data = {
-                'camera_matrix': camera_matrix.tolist(),
-                'dist_coeffs': dist_coeffs.tolist(),
-                'rms': float(ret),
-                'image_size': self.image_size
-            }
-            
-            self.progress.emit(f"Calibration successful! RMS = {ret:.4f}")
-            self.finished.emit(True, f"Calibration completed with RMS error: {ret:.4f}", calib_data)
-            
-        except Exception as e:
-            self.finished.emit(False, f"Calibration failed: {str(e)}", None)
+            while self._conn.poll():
+                message = self._conn.recv()
+                if message[0] == 'progress':
+                    self.progress.emit(message[1])
+                else:
+                    self._finish(*message[1:])
+                    return
+        except (EOFError, OSError):
+            # Pipe closed without a result - the process died
+            self._finish(False, f"Calibration process exited unexpectedly "
+                                f"(exit code {self.process.exitcode})", None)
+    
+    def _finish(self, success, message, calib_data):
+        """Clean up the process and report the result"""
+        self._poll_timer.stop()
+        self._conn.close()
+        self.process.join()
+        self.finished.emit(success, message, calib_data)
 
 
 class IntrinsicCalibration:
@@ -64,9 +290,44 @@ class IntrinsicCalibration:
     
     def __init__(self):
         """Initialize calibration data storage"""
-        self.all_charuco_corners = []
-        self.all_charuco_ids = []
+        # Captured corners/IDs are packed back to back in two preallocated
+        # arrays (SoA); frame i spans _frame_offsets[i]:_frame_offsets[i + 1]
+        self._max_corners = (SQUARES_X - 1) * (SQUARES_Y - 1)
+        self._n_frames = 0
+        self._allocate(INITIAL_FRAME_CAPACITY)
         self.image_size = None
+    
+    def _allocate(self, capacity):
+        """(Re)allocate storage for capacity frames, keeping already captured frames"""
+        corners = np.empty((capacity * self._max_corners, 1, 2), np.float32)
+        ids = np.empty((capacity * self._max_corners, 1), np.int32)
+        offsets = np.zeros(capacity + 1, np.intp)
+        
+        n = self._n_frames
+        if n:
+            used = self._frame_offsets[n]
+            corners[:used] = self._corners[:used]
+            ids[:used] = self._ids[:used]
+            offsets[:n + 1] = self._frame_offsets[:n + 1]
+        
+        self._corners, self._ids, self._frame_offsets = corners, ids, offsets
+    
+    @property
+    def frame_offsets(self):
+        """np.ndarray: (n_frames + 1,) start offsets of each frame in the packed storage"""
+        return self._frame_offsets[:self._n_frames + 1]
+    
+    @property
+    def all_charuco_corners(self):
+        """list: Per-frame (N, 1, 2) float32 views of the captured corners"""
+        o = self._frame_offsets
+        return [self._corners[o[i]:o[i + 1]] for i in range(self._n_frames)]
+    
+    @property
+    def all_charuco_ids(self):
+        """list: Per-frame (N, 1) int32 views of the captured corner IDs"""
+        o = self._frame_offsets
+        return [self._ids[o[i]:o[i + 1]] for i in range(self._n_frames)]
         
     def add_frame(self, charuco_corners, charuco_ids, image_size):
         """
@@ -79,14 +340,31 @@ class IntrinsicCalibration:
         
         Returns:
             int: Total number of frames captured
+        
+        Raises:
+            ValueError: If more corners are given than the board has
         """
-        self.all_charuco_corners.append(charuco_corners)
-        self.all_charuco_ids.append(charuco_ids)
+        n = len(charuco_ids)
+        if n > self._max_corners:
+            raise ValueError(f"Frame has {n} corners but the board only has {self._max_corners}")
+        
+        if self._n_frames == len(self._frame_offsets) - 1:
+            self._allocate(2 * (len(self._frame_offsets) - 1))
+        
+        i = self._n_frames
+        start = self._frame_offsets[i]
+        end = start + n
+        # Copy straight into the packed storage; ids may be (N, 1) or (N,) and
+        # any dtype conversion happens during the copy
+        self._corners[start:end] = np.reshape(charuco_corners, (n, 1, 2))
+        self._ids[start:end, 0] = np.reshape(charuco_ids, -1)
+        self._frame_offsets[i + 1] = end
+        self._n_frames += 1
         
         if self.image_size is None:
             self.image_size = image_size
         
-        return len(self.all_charuco_corners)
+        return self._n_frames
     
     def get_frame_count(self):
         """
@@ -95,23 +373,22 @@ class IntrinsicCalibration:
         Returns:
             int: Number of frames
         """
-        return len(self.all_charuco_corners)
+        return self._n_frames
     
     def clear_frames(self):
         """Clear all captured calibration frames"""
-        self.all_charuco_corners = []
-        self.all_charuco_ids = []
+        self._n_frames = 0
         self.image_size = None
     
     def run_calibration(self, board):
         """
-        Create and return a CalibrationWorker thread to run calibration.
+        Create and return a CalibrationWorker to run calibration.
         
         Args:
             board: ChArUco board instance
         
         Returns:
-            CalibrationWorker: Thread ready to start
+            CalibrationWorker: Worker ready to start
         
         Raises:
             ValueError: If insufficient frames collected
@@ -129,7 +406,7 @@ class IntrinsicCalibration:
     @staticmethod
     def save_calibration(calib_data, filepath=None):
         """
-        Save calibration data to JSON file.
+        Save calibration data to a JSON file, or binary arrays for a .npz path.
         
         Args:
             calib_data (dict): Calibration data containing camera_matrix, dist_coeffs, rms, image_size
@@ -141,15 +418,19 @@ class IntrinsicCalibration:
         if filepath is None:
             filepath = CALIB_FILE
         
-        with open(filepath, 'w') as f:
-            json.dump(calib_data, f, indent=2)
+        if str(filepath).endswith('.npz'):
+            save_calibration_npz(filepath, calib_data['camera_matrix'], calib_data['dist_coeffs'],
+                                 calib_data['rms'], calib_data['image_size'])
+            return filepath
+        
+        write_json(filepath, calib_data)
         
         return filepath
     
     @staticmethod
     def load_calibration(filepath=None):
         """
-        Load calibration data from JSON file.
+        Load calibration data from a JSON file (or .npz, see save_calibration).
         
         Args:
             filepath (str, optional): Input file path. Defaults to CALIB_FILE from config
@@ -163,8 +444,11 @@ class IntrinsicCalibration:
         if filepath is None:
             filepath = CALIB_FILE
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if str(filepath).endswith('.npz'):
+            data = load_calibration_npz(filepath)
+            return data['camera_matrix'], data['dist_coeffs']
+        
+        data = read_json(filepath)
         
         camera_matrix = np.array(data['camera_matrix'], dtype=np.float64)
         dist_coeffs = np.array(data['dist_coeffs'], dtype=np.float64)
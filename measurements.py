@@ -5,11 +5,53 @@ Handles 3D distance measurements from 2D image points using camera calibration d
 Projects image points to a measurement plane and computes real-world distances.
 """
 
+import functools
+import math
+import os
 import cv2
 import numpy as np
-import json
+from intrinsic_calibration import IntrinsicCalibration
+from extrinsic_calibration import ExtrinsicCalibration
 from config import CALIB_FILE, EXTRINSICS_FILE
 
+# Click point slots preallocated (grown by doubling when full)
+INITIAL_CLICK_CAPACITY = 4
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(loader, filepath, stamp):
+    """
+    Run a calibration file loader once per file version.
+    
+    Args:
+        loader (callable): filepath -> tuple of numpy arrays
+        filepath (str): File to load
+        stamp (tuple): (mtime_ns, size) of the file; a new value misses the cache
+    
+    Returns:
+        tuple: The loader's arrays, which must not be modified
+    """
+    return loader(filepath)
+
+
+def _load_with_cache(loader, filepath):
+    """
+    Load a calibration file, reusing the parsed arrays while it is unchanged.
+    
+    Args:
+        loader (callable): filepath -> tuple of numpy arrays
+        filepath (str): File to load
+    
+    Returns:
+        tuple: Copies of the loaded arrays (callers may modify them)
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    st = os.stat(filepath)
+    arrays = _load_cached(loader, os.path.abspath(filepath), (st.st_mtime_ns, st.st_size))
+    return tuple(a.copy() for a in arrays)
+
 
 class Measurement:
     """Manages measurement workflow with calibrated camera"""
@@ -28,7 +70,18 @@ class Measurement:
         self.dist_coeffs = dist_coeffs
         self.rvec = rvec
         self.tvec = tvec
-        self.click_points = []
+        self._points = np.empty((INITIAL_CLICK_CAPACITY, 2), np.float64)
+        self._n_points = 0
+        
+        # Undistortion remap LUT, built lazily for the incoming frame size
+        self.map1 = None
+        self.map2 = None
+        self._map1_u = None  # OpenCL (UMat) copies of the LUT, if available
+        self._map2_u = None
+        self._map_size = None
+        self._undist_buf = None
+        
+        self._cache_projection()
     
     def set_calibration(self, camera_matrix, dist_coeffs, rvec, tvec):
         """
@@ -40,17 +93,102 @@ class Measurement:
             rvec (np.ndarray): Rotation vector
             tvec (np.ndarray): Translation vector
         """
-        self.camera_matrix = camera_matrix
-        self.dist_coeffs = dist_coeffs
-        self.rvec = rvec
-        self.tvec = tvec
+        # Own copies: the cached maps and homography must not change behind
+        # our back if the caller later modifies its arrays
+        self.camera_matrix = np.array(camera_matrix, dtype=np.float64)
+        self.dist_coeffs = np.array(dist_coeffs, dtype=np.float64)
+        self.rvec = np.array(rvec, dtype=np.float64)
+        self.tvec = np.array(tvec, dtype=np.float64)
+        
+        # Intrinsics changed - drop the cached remap LUT
+        self.map1 = None
+        self.map2 = None
+        self._map1_u = None
+        self._map2_u = None
+        self._map_size = None
+        self._undist_buf = None
+        
+        self._cache_projection()
+    
+    def _cache_projection(self):
+        """Precompute the calibration-dependent constants used by image_to_plane()"""
+        if self.camera_matrix is None or self.rvec is None or self.tvec is None:
+            self._H = None
+            return
+        
+        R, _ = cv2.Rodrigues(self.rvec)
+        t = np.asarray(self.tvec, dtype=np.float64).reshape(-1)
+        
+        # Board points (x, y, 0) image to pixels through K [r1 r2 t], so the
+        # inverse homography maps a pixel straight to board (x, y, w). Scaling
+        # by -d (d: plane offset along its normal) makes w the ray-normal dot
+        # product, so the parallel-ray threshold keeps its meaning
+        d = -R[:, 2].dot(t)
+        self._H = -d * np.linalg.inv(self.camera_matrix @ np.column_stack([R[:, 0], R[:, 1], t]))
+    
+    def build_undistort_maps(self, image_size):
+        """
+        Precompute the undistortion remap LUT for a given image size.
+        
+        The original camera matrix is kept as the new camera matrix so that
+        pixel coordinates in the undistorted image stay consistent with
+        image_to_plane().
+        
+        Args:
+            image_size (tuple): Image dimensions (width, height)
+        
+        Raises:
+            ValueError: If camera calibration not set
+        """
+        if self.camera_matrix is None or self.dist_coeffs is None:
+            raise ValueError("Camera calibration not set")
+        
+        # CV_16SC2 fixed-point maps are the most bandwidth-friendly for remap
+        self.map1, self.map2 = cv2.initUndistortRectifyMap(
+            self.camera_matrix, self.dist_coeffs, None,
+            self.camera_matrix, image_size, cv2.CV_16SC2
+        )
+        
+        # Keep device-side copies so remap runs through OpenCL (T-API) on a GPU
+        if cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL():
+            self._map1_u = cv2.UMat(self.map1)
+            self._map2_u = cv2.UMat(self.map2)
+        else:
+            self._map1_u = None
+            self._map2_u = None
+        
+        self._map_size = image_size
+        self._undist_buf = None
     
-    def undistort_frame(self, frame):
+    def get_undistort_maps(self, image_size):
+        """
+        Get the undistortion remap LUT for a given image size, building it if needed.
+        
+        Args:
+            image_size (tuple): Image dimensions (width, height)
+        
+        Returns:
+            tuple: (map1, map2) for cv2.remap
+        
+        Raises:
+            ValueError: If camera calibration not set
+        """
+        if self.map1 is None or self._map_size != image_size:
+            self.build_undistort_maps(image_size)
+        return self.map1, self.map2
+    
+    def undistort_frame(self, frame, dst=None):
         """
         Apply lens distortion correction to a frame.
         
+        Uses the cached remap LUT (rebuilt only when the frame size changes),
+        on the GPU through OpenCL when available. Without dst the result is
+        written into a reused internal buffer, so the returned array is
+        overwritten by the next call. Copy it if it must be kept.
+        
         Args:
             frame (np.ndarray): Input image
+            dst (np.ndarray, optional): Output buffer with the same shape as frame
         
         Returns:
             np.ndarray: Undistorted image
@@ -61,7 +199,27 @@ class Measurement:
         if self.camera_matrix is None or self.dist_coeffs is None:
             raise ValueError("Camera calibration not set")
         
-        return cv2.undistort(frame, self.camera_matrix, self.dist_coeffs)
+        map1, map2 = self.get_undistort_maps((frame.shape[1], frame.shape[0]))
+        # Read the OpenCL maps once: set_calibration() may reset them from
+        # another thread while this frame is being remapped
+        m1u, m2u = self._map1_u, self._map2_u
+        
+        if dst is None:
+            if self._undist_buf is None or self._undist_buf.shape != frame.shape:
+                self._undist_buf = np.empty_like(frame)
+            dst = self._undist_buf
+        
+        if m1u is not None and m2u is not None:
+            undistorted = cv2.remap(cv2.UMat(frame), m1u, m2u, cv2.INTER_LINEAR)
+            np.copyto(dst, undistorted.get())
+            return dst
+        
+        return cv2.remap(frame, map1, map2, cv2.INTER_LINEAR, dst=dst)
+    
+    @property
+    def click_points(self):
+        """np.ndarray: (N, 2) float64 view of the clicked points"""
+        return self._points[:self._n_points]
     
     def add_click_point(self, pixel_coords):
         """
@@ -73,8 +231,14 @@ class Measurement:
         Returns:
             int: Number of points stored
         """
-        self.click_points.append(pixel_coords)
-        return len(self.click_points)
+        if self._n_points == len(self._points):
+            grown = np.empty((2 * len(self._points), 2), np.float64)
+            grown[:self._n_points] = self._points
+            self._points = grown
+        
+        self._points[self._n_points] = pixel_coords
+        self._n_points += 1
+        return self._n_points
     
     def get_click_count(self):
         """
@@ -83,23 +247,23 @@ class Measurement:
         Returns:
             int: Number of points
         """
-        return len(self.click_points)
+        return self._n_points
     
     def reset_points(self):
-        """Clear all clicked points"""
-        self.click_points = []
+        """Clear all clicked points (the storage is kept for reuse)"""
+        self._n_points = 0
     
     def compute_distance(self):
         """
         Compute 3D distance between two clicked points.
         
+        Missing calibration, too few points or a click whose ray is parallel
+        to the plane are reported through the success flag and message.
+        
         Returns:
             tuple: (success, message, distance_m, distance_cm, point1_3d, point2_3d)
-        
-        Raises:
-            ValueError: If calibration not complete or insufficient points
         """
-        if len(self.click_points) < 2:
+        if self._n_points < 2:
             return False, "Need 2 points for distance measurement", None, None, None, None
         
         if self.camera_matrix is None or self.dist_coeffs is None:
@@ -108,72 +272,61 @@ class Measurement:
         if self.rvec is None or self.tvec is None:
             return False, "Camera extrinsics not loaded", None, None, None, None
         
+        # Project both points to the measurement plane in one pass
         try:
-            # Get rotation matrix from rvec
-            R, _ = cv2.Rodrigues(self.rvec)
-            
-            # Plane normal in camera frame (Z-axis of board frame)
-            plane_normal_cam = R[:, 2]
-            
-            # Distance from origin to plane along normal
-            d = -plane_normal_cam.dot(self.tvec.flatten())
-            
-            # Project both points to the measurement plane
-            pt1_3d = self.image_to_plane(self.click_points[0], R, plane_normal_cam, d)
-            pt2_3d = self.image_to_plane(self.click_points[1], R, plane_normal_cam, d)
-            
-            # Compute Euclidean distance
-            distance_m = np.linalg.norm(pt2_3d - pt1_3d)
-            distance_cm = distance_m * 100
-            
-            return True, "Distance computed successfully", distance_m, distance_cm, pt1_3d, pt2_3d
-            
-        except Exception as e:
-            return False, f"Error computing distance: {str(e)}", None, None, None, None
-    
-    def image_to_plane(self, pt, R, plane_normal_cam, d):
-        """
-        Project image point to measurement plane using ray-plane intersection.
+            pt1_3d, pt2_3d = self.image_to_plane(self.click_points[:2])
+        except ValueError as e:
+            return False, f"Error computing distance: {e}", None, None, None, None
+        
+        # Euclidean distance; both points lie on the plane (z = 0)
+        distance_m = math.hypot(pt2_3d[0] - pt1_3d[0], pt2_3d[1] - pt1_3d[1])
+        distance_cm = distance_m * 100
+        
+        return True, "Distance computed successfully", distance_m, distance_cm, pt1_3d, pt2_3d
+    
+    def image_to_plane(self, pts):
+        """
+        Project image points to measurement plane using ray-plane intersection.
+        
+        The intersection is applied as the image-to-board homography cached by
+        set_calibration(): one matrix product and a divide by the third
+        component for all points, with no Rodrigues or inversion per call.
         
         Args:
-            pt (tuple): (x, y) pixel coordinates
-            R (np.ndarray): Rotation matrix (3x3)
-            plane_normal_cam (np.ndarray): Plane normal in camera frame (3,)
-            d (float): Distance from origin to plane
+            pts (array-like): (N, 2) pixel coordinates, or a single (x, y) point
         
         Returns:
-            np.ndarray: 3D point on plane (x, y, z) in board coordinates
+            np.ndarray: (N, 3) points on plane (x, y, z) in board coordinates
         
         Raises:
-            RuntimeError: If ray is parallel to plane
+            ValueError: If any ray is parallel to plane
         """
-        # Points come from the UNDISTORTED image, so we only need to apply
-        # the inverse camera matrix to get normalized ray direction.
+        pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2)
+        
+        # Points come from the UNDISTORTED image, so the homography (which
+        # only contains the pinhole model) applies directly.
         # Do NOT call cv2.undistortPoints() here — that would double-undistort
         # since the frozen frame the user clicks on is already undistorted.
-        fx = self.camera_matrix[0, 0]
-        fy = self.camera_matrix[1, 1]
-        cx = self.camera_matrix[0, 2]
-        cy = self.camera_matrix[1, 2]
-
-        x = (pt[0] - cx) / fx
-        y = (pt[1] - cy) / fy
-        ray_cam = np.array([x, y, 1.0])
+        h = pts @ self._H[:, :2].T + self._H[:, 2]
         
-        denom = plane_normal_cam.dot(ray_cam)
-        if abs(denom) < 1e-9:
-            raise RuntimeError('Ray nearly parallel to plane')
+        w = h[:, 2]
+        if np.any(np.abs(w) < 1e-9):
+            raise ValueError('Ray nearly parallel to plane')
         
-        s = -d / denom
-        Xc = s * ray_cam
-        obj_xy = R[:, :2].T.dot(Xc - self.tvec.flatten())
-        
-        return np.array([obj_xy[0], obj_xy[1], 0.0])
+        obj = np.zeros_like(h)
+        obj[:, :2] = h[:, :2] / w[:, None]
+        return obj
     
     @staticmethod
     def load_calibrations(calib_path=None, extrin_path=None):
         """
-        Load both intrinsic and extrinsic calibrations from files.
+        Load both intrinsic and extrinsic calibrations from JSON or .npz files.
+        
+        Parsed files are cached by path, modification time and size, so
+        repeated loads of unchanged files skip the parsing. Filesystems with
+        coarse timestamps (1-2 s) can miss a same-size rewrite, so code that
+        writes these files must call invalidate_calibration_cache() after
+        saving.
         
         Args:
             calib_path (str, optional): Intrinsics file path. Defaults to CALIB_FILE
@@ -185,23 +338,14 @@ class Measurement:
         Raises:
             FileNotFoundError: If calibration files don't exist
         """
-        if calib_path is None:
-            calib_path = CALIB_FILE
-        if extrin_path is None:
-            extrin_path = EXTRINSICS_FILE
-        
-        # Load intrinsics
-        with open(calib_path, 'r') as f:
-            calib_data = json.load(f)
-        
-        camera_matrix = np.array(calib_data['camera_matrix'], dtype=np.float64)
-        dist_coeffs = np.array(calib_data['dist_coeffs'], dtype=np.float64)
-        
-        # Load extrinsics
-        with open(extrin_path, 'r') as f:
-            extrin_data = json.load(f)
-        
-        rvec = np.array(extrin_data['rvec'], dtype=np.float64).reshape(3, 1)
-        tvec = np.array(extrin_data['tvec'], dtype=np.float64).reshape(3, 1)
+        camera_matrix, dist_coeffs = _load_with_cache(
+            IntrinsicCalibration.load_calibration, calib_path or CALIB_FILE)
+        rvec, tvec = _load_with_cache(
+            ExtrinsicCalibration.load_extrinsics, extrin_path or EXTRINSICS_FILE)
         
         return camera_matrix, dist_coeffs, rvec, tvec
+    
+    @staticmethod
+    def invalidate_calibration_cache():
+        """Drop all cached calibration files (call after saving or editing them)"""
+        _load_cached.cache_clear()
@@ -2,21 +2,268 @@
 Video Thread Module - Background Video Capture and Processing
 
 Provides QThread-based video capture with ChArUco detection for real-time display.
+Frames are published to a single "latest frame wins" slot instead of being queued
+as signals, so a slow GUI never falls behind the camera.
 """
 
+import threading
+import time
 import cv2
-from PyQt6.QtCore import QThread, pyqtSignal
+import numpy as np
+from PyQt6.QtCore import QThread
 from PyQt6.QtGui import QImage
 import camera_utils
-from config import INVERT_COLORS
+from config import (INVERT_COLORS, PROCESSING_SIZE, DETECT_EVERY, DETECTION_SCALE,
+                    CAMERA_FOURCC, CAMERA_FPS)
+
+VIDEO_MODES = ('calib', 'extrin', 'measure')
+
+# A grab() faster than this was served from the driver queue (stale frame)
+QUEUED_GRAB_MAX_S = 0.005
+# Upper bound on queued frames skipped per read (V4L2/DSHOW queue ~4 deep)
+MAX_SKIPPED_FRAMES = 4
+
+# Banner drawn on the undistorted measurement feed: text, baseline origin, style
+BANNER_TEXT = "Undistorted Feed"
+BANNER_ORIGIN = (20, 40)
+BANNER_STYLE = (cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3)
+
+# cornerSubPix half-window and stop criteria for refining upscaled corners
+SUBPIX_WINDOW = (5, 5)
+SUBPIX_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.01)
+
+
+def ndarray_to_qimage(frame, image_format=QImage.Format.Format_BGR888):
+    """
+    Wrap a 3-channel uint8 image as a QImage without copying the pixels.
+    
+    QImage only borrows the buffer, so the array is attached to the QImage to
+    keep it alive until Qt is done with it (no defensive .copy() needed).
+    
+    Args:
+        frame (np.ndarray): C-contiguous (H, W, 3) uint8 image
+        image_format (QImage.Format): Byte order of frame. Defaults to BGR888
+    
+    Returns:
+        QImage: Image sharing frame's memory
+    """
+    h, w, ch = frame.shape
+    qt_image = QImage(frame.data, w, h, ch * w, image_format)
+    qt_image._keep = frame
+    return qt_image
+
+
+def render_text_sprite(text, font, font_scale, color, thickness):
+    """
+    Rasterize text once so it can be stamped onto frames without cv2.putText.
+    
+    Args:
+        text (str): Text to render
+        font (int): OpenCV Hershey font
+        font_scale (float): Font scale
+        color (tuple): BGR text color
+        thickness (int): Stroke thickness
+    
+    Returns:
+        tuple: (sprite, mask, origin) - BGR sprite, uint8 mask of the text
+               pixels, and the (x, y) baseline origin inside the sprite
+    """
+    (text_w, text_h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+    pad = thickness
+    sprite = np.zeros((text_h + baseline + 2 * pad, text_w + 2 * pad, 3), dtype=np.uint8)
+    origin = (pad, pad + text_h)
+    cv2.putText(sprite, text, origin, font, font_scale, color, thickness)
+    mask = sprite.any(axis=2).astype(np.uint8)
+    return sprite, mask, origin
+
+
+def stamp_sprite(frame, sprite, mask, position):
+    """
+    Copy a text sprite's masked pixels onto frame in place.
+    
+    Args:
+        frame (np.ndarray): BGR image to draw on
+        sprite (np.ndarray): Sprite from render_text_sprite()
+        mask (np.ndarray): Sprite mask from render_text_sprite()
+        position (tuple): (x, y) of the sprite's top-left corner in frame
+    """
+    x, y = position
+    h = min(sprite.shape[0], frame.shape[0] - y)
+    w = min(sprite.shape[1], frame.shape[1] - x)
+    if h <= 0 or w <= 0:
+        return
+    # copyTo writes straight into the ROI view of frame
+    cv2.copyTo(sprite[:h, :w], mask[:h, :w], frame[y:y + h, x:x + w])
+
+
+def detect_charuco(detector, frame, invert_colors=INVERT_COLORS):
+    """
+    Run ChArUco board detection on a BGR frame.
+    
+    Args:
+        detector: ChArUco detector instance
+        frame (np.ndarray): BGR image
+        invert_colors (bool): Invert the grayscale image before detection
+    
+    Returns:
+        tuple: (charuco_corners, charuco_ids, marker_corners, marker_ids)
+               as returned by detector.detectBoard()
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if invert_colors:
+        cv2.bitwise_not(gray, dst=gray)  # in place, no second image buffer
+    
+    return detector.detectBoard(gray)
+
+
+def refine_corners(frame, corners, win=SUBPIX_WINDOW):
+    """
+    Refine corner positions to sub-pixel accuracy on a full-resolution frame.
+    
+    Only the bounding box around the corners (plus the search window) is
+    converted to grayscale and searched, not the whole frame.
+    
+    Args:
+        frame (np.ndarray): BGR image the corners belong to
+        corners (np.ndarray): (N, 1, 2) float32 corner estimates in frame pixels
+        win (tuple): cornerSubPix half-window size
+    
+    Returns:
+        np.ndarray: Refined (N, 1, 2) float32 corners
+    """
+    h, w = frame.shape[:2]
+    margin = max(win) + 2
+    pts = corners.reshape(-1, 2)
+    x0, y0 = np.maximum(np.floor(pts.min(axis=0)).astype(int) - margin, 0)
+    x1, y1 = np.minimum(np.ceil(pts.max(axis=0)).astype(int) + margin + 1, (w, h))
+    
+    gray = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+    offset = np.array([x0, y0], dtype=np.float32)
+    
+    refined = (corners - offset).astype(np.float32)
+    cv2.cornerSubPix(gray, refined, win, (-1, -1), SUBPIX_CRITERIA)
+    refined += offset
+    return refined
+
+
+class FrameBufferRing:
+    """
+    Preallocated output frames handed out in rotation.
+    
+    Published frames are read by the GUI after the thread moves on. The
+    caller passes the buffers still in use (published but not yet taken, and
+    the one the GUI is showing) to next(), which never hands those out, so
+    a stalled GUI can not have its frame overwritten.
+    """
+    
+    def __init__(self, count=3):
+        """
+        Initialize the ring.
+        
+        Args:
+            count (int): Number of buffers to rotate through
+        """
+        self._bufs = [None] * count
+        self._idx = 0
+    
+    def next(self, shape, dtype=np.uint8, busy=()):
+        """
+        Get the next free buffer, (re)allocating it if the frame shape changed.
+        
+        Args:
+            shape (tuple): Required array shape
+            dtype (np.dtype): Required array dtype
+            busy (tuple): Buffers still being read, which must not be reused
+        
+        Returns:
+            np.ndarray: Uninitialized buffer of the requested shape
+        
+        Raises:
+            RuntimeError: If every buffer is busy
+        """
+        for _ in range(len(self._bufs)):
+            idx = self._idx
+            self._idx = (self._idx + 1) % len(self._bufs)
+            buf = self._bufs[idx]
+            if buf is not None and any(buf is b for b in busy):
+                continue
+            if buf is None or buf.shape != shape or buf.dtype != dtype:
+                buf = self._bufs[idx] = np.empty(shape, dtype=dtype)
+            return buf
+        raise RuntimeError("All frame buffers are in use")
+
+
+class DetectionWorker(threading.Thread):
+    """
+    Runs ChArUco detection off the capture thread.
+    
+    Frames are handed over through a single slot: submitting replaces any
+    frame the worker has not picked up yet, so detection always runs on the
+    newest frame and never falls behind the camera. Results are tagged with
+    the generation they were submitted under, so results for a superseded
+    mode can be discarded, and carry the context submitted with the frame
+    (e.g. the raw frame the corners belong to).
+    """
+    
+    def __init__(self, detect_fn):
+        """
+        Initialize the worker.
+        
+        Args:
+            detect_fn (callable): frame -> (charuco_corners, charuco_ids,
+                                  marker_corners, marker_ids)
+        """
+        super().__init__(daemon=True)
+        self._detect = detect_fn
+        self._cond = threading.Condition()
+        self._pending = None  # (generation, frame, context) waiting to be detected
+        self._running = True
+        self.result = (None, (None, None, None, None), None)  # (generation, detection, context)
+        self.error = None
+    
+    def submit(self, frame, generation, context=None):
+        """
+        Queue a frame for detection, replacing any frame still waiting.
+        
+        Args:
+            frame (np.ndarray): BGR frame; must not be modified afterwards
+            generation (int): Tag returned with the result
+            context (object, optional): Returned unchanged with the result
+        """
+        with self._cond:
+            self._pending = (generation, frame, context)
+            self._cond.notify()
+    
+    def stop(self):
+        """Stop the worker and wait for the current detection to finish"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self.join()
+    
+    def run(self):
+        """Detect on each newly submitted frame until stopped"""
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                generation, frame, context = self._pending
+                self._pending = None
+            
+            try:
+                self.result = (generation, self._detect(frame), context)
+            except Exception as e:
+                self.error = e
+                return
 
 
 class VideoThread(QThread):
     """Thread for continuous video capture and processing"""
-    change_pixmap = pyqtSignal(QImage)
-    detection_info = pyqtSignal(dict)
     
-    def __init__(self, camera_source, detector, board, invert_colors=None):
+    def __init__(self, camera_source, detector, board, invert_colors=None, proc_size=None,
+                 detect_every=None, detect_scale=None):
         """
         Initialize video capture thread.
         
@@ -26,6 +273,15 @@ class VideoThread(QThread):
             board: ChArUco board instance
             invert_colors (bool, optional): Whether to invert colors before detection. 
                                        If None, uses INVERT_COLORS from config
+            proc_size (tuple, optional): Maximum (width, height) frames are downscaled to
+                                         for detection and display. If None, uses
+                                         PROCESSING_SIZE from config
+            detect_every (int, optional): Submit every Nth frame for detection; the
+                                          latest result is redrawn on every frame.
+                                          If None, uses DETECT_EVERY from config
+            detect_scale (float, optional): Resize factor applied to the preview frame
+                                            before detection. If None, uses
+                                            DETECTION_SCALE from config
         """
         super().__init__()
         self.camera_source = camera_source
@@ -34,6 +290,38 @@ class VideoThread(QThread):
         self.running = True
         self.cap = None
         self.invert_colors = invert_colors if invert_colors is not None else INVERT_COLORS
+        self.proc_size = proc_size if proc_size is not None else PROCESSING_SIZE
+        self.mode = 'calib'
+        # ChArUco detection (the most expensive per-frame step) can be switched
+        # off independently of the mode; set_mode() sets the mode's default
+        self.detect_enabled = True
+        self.detect_every = max(1, detect_every if detect_every is not None else DETECT_EVERY)
+        self.detect_scale = detect_scale if detect_scale is not None else DETECTION_SCALE
+        self._frame_idx = 0
+        self._generation = 0  # bumped by set_mode() to discard in-flight results
+        self._detector_worker = None
+        
+        # Build the annotated / undistorted display image; switched off while
+        # nothing shows the live feed (e.g. a frozen measurement)
+        self.draw_overlay = True
+        
+        # Measurement mode undistortion source
+        self.undistort_source = None
+        self._banner = None  # (sprite, mask, top-left), rendered on first use
+        
+        # Output frames (annotated preview / undistorted feed): one being
+        # written, one published and one shown by the GUI
+        self._display_bufs = FrameBufferRing(3)
+        
+        # Frames skipped by read_latest() since start(), reported in the info dict
+        self.dropped_frames = 0
+        
+        # Newest (QImage, detection info) pair, overwritten by every frame,
+        # and the arrays behind the published and the GUI's current QImage
+        self._latest = None
+        self._latest_buf = None
+        self._shown_buf = None
+        self._latest_lock = threading.Lock()
         
     def run(self):
         """Main thread execution loop - captures and processes frames"""
@@ -44,53 +332,303 @@ class VideoThread(QThread):
             if not self.cap.isOpened():
                 raise RuntimeError(f"Cannot open camera {self.camera_source}")
             
+            # Request a compressed stream first: V4L2 negotiates the format
+            # before the size, and raw YUYV at 1280×960 saturates USB 2.0 well
+            # below 30 FPS (backends that don't support it ignore the request)
+            if CAMERA_FOURCC:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAMERA_FOURCC))
+            
             # Set camera resolution to 1280×960 for better calibration accuracy
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 960)
             
+            # Pin the rate so the driver doesn't pick a faster mode and queue
+            # frames faster than the preview consumes them
+            if CAMERA_FPS:
+                self.cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+            
+            # Detection runs on its own thread so the preview keeps the camera's
+            # frame rate; OpenCV releases the GIL while it detects
+            self._detector_worker = DetectionWorker(self.detect_preview)
+            self._detector_worker.start()
+            
+            raw_shape = None
             while self.running:
-                ret, frame = self.cap.read()
+                ret, raw = self.read_latest()
                 if not ret:
                     continue
-                    
-                # Process frame
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                if self.invert_colors:
-                    gray = cv2.bitwise_not(gray)
-
                 
-                charuco_corners, charuco_ids, marker_corners, marker_ids = self.detector.detectBoard(gray)
+                # The measurement tab only needs the undistorted raw feed
+                if self.mode == 'measure':
+                    info = {
+                        'corners_detected': 0,
+                        'charuco_corners': None,
+                        'charuco_ids': None,
+                        'scale': 1.0,
+                        'detect_scale': 1.0,
+                        'fresh': False,
+                        'dropped': self.dropped_frames,
+                        'frame': raw
+                    }
+                    out = self.undistort_for_display(raw) if self.draw_overlay else raw
+                    self.publish(out, info)
+                    continue
                 
+                # Downscale once to the processing size; the raw frame is kept
+                # in the detection info for full-resolution consumers
+                if raw.shape != raw_shape:
+                    raw_shape = raw.shape
+                    scale, target_size = self.get_processing_scale(raw.shape)
+                if scale < 1.0:
+                    frame = cv2.resize(raw, target_size, interpolation=cv2.INTER_AREA)
+                else:
+                    frame = raw
+                    
+                # Hand the frame to the detector and draw its latest result.
+                # The result comes with the raw frame it was detected on, so
+                # captures get corners and pixels that belong together
+                charuco_corners = charuco_ids = marker_corners = marker_ids = None
+                detected_raw, detected_scale = raw, scale
+                fresh = False
+                if self.detect_enabled:
+                    worker = self._detector_worker
+                    if worker.error is not None:
+                        raise worker.error
+                    if self._frame_idx % self.detect_every == 0:
+                        worker.submit(frame, self._generation, (raw, scale))
+                    self._frame_idx += 1
+                    
+                    generation, detection, context = worker.result
+                    if generation == self._generation:
+                        charuco_corners, charuco_ids, marker_corners, marker_ids = detection
+                        detected_raw, detected_scale = context
+                        fresh = True
                 
-                # Draw detections
-                display_frame = frame.copy()
-                if marker_ids is not None and len(marker_ids) > 0:
-                    cv2.aruco.drawDetectedMarkers(display_frame, marker_corners, marker_ids)
-                if charuco_ids is not None and len(charuco_ids) > 0:
-                    cv2.aruco.drawDetectedCornersCharuco(display_frame, charuco_corners, charuco_ids)
+                # Draw detections (the frame itself is never drawn on: the
+                # detection worker and the info consumers may still read it)
+                if self.draw_overlay:
+                    display_frame = self.next_display_buffer(frame.shape)
+                    np.copyto(display_frame, frame)
+                    if marker_ids is not None and len(marker_ids) > 0:
+                        cv2.aruco.drawDetectedMarkers(display_frame, marker_corners, marker_ids)
+                    if charuco_ids is not None and len(charuco_ids) > 0:
+                        cv2.aruco.drawDetectedCornersCharuco(display_frame, charuco_corners, charuco_ids)
+                else:
+                    display_frame = frame
                 
-                # Emit detection info
+                # Detection info
                 info = {
                     'corners_detected': len(charuco_ids) if charuco_ids is not None else 0,
                     'charuco_corners': charuco_corners,
                     'charuco_ids': charuco_ids,
-                    'frame': frame
+                    'scale': detected_scale,  # charuco_corners are in raw-frame pixels * scale
+                    # resolution detection ran at, relative to the raw frame
+                    'detect_scale': detected_scale * min(self.detect_scale, 1.0),
+                    'fresh': fresh,  # False if there is no detection for 'frame'
+                    'dropped': self.dropped_frames,
+                    'frame': detected_raw  # the frame the corners were detected on
                 }
-                self.detection_info.emit(info)
                 
-                # Convert to Qt format
-                rgb_image = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_image.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-                self.change_pixmap.emit(qt_image)
+                self.publish(display_frame, info)
                 
         except Exception as e:
             print(f"Video thread error: {e}")
         finally:
+            if self._detector_worker is not None:
+                self._detector_worker.stop()
+                self._detector_worker = None
             if self.cap:
                 self.cap.release()
     
+    def detect_preview(self, frame):
+        """
+        Detect the board on a detect_scale copy of the preview frame.
+        
+        The overlay does not need sub-pixel accuracy, so detection runs on
+        fewer pixels; captures refine the corners on the raw frame.
+        
+        Args:
+            frame (np.ndarray): BGR preview frame
+        
+        Returns:
+            tuple: (charuco_corners, charuco_ids, marker_corners, marker_ids)
+                   with corners in preview-frame pixels
+        """
+        scale = self.detect_scale
+        if scale >= 1.0:
+            return detect_charuco(self.detector, frame, self.invert_colors)
+        
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        charuco_corners, charuco_ids, marker_corners, marker_ids = detect_charuco(
+            self.detector, small, self.invert_colors)
+        
+        inv = np.float32(1.0 / scale)
+        if charuco_corners is not None:
+            charuco_corners = charuco_corners * inv
+        if marker_corners:
+            marker_corners = tuple(c * inv for c in marker_corners)
+        return charuco_corners, charuco_ids, marker_corners, marker_ids
+    
+    def read_latest(self):
+        """
+        Read the newest camera frame, dropping frames queued in the driver.
+        
+        grab() only fetches a frame without decoding it. Grabs that return
+        immediately come from the driver queue, so keep grabbing until one
+        has to wait for a new frame, then decode just that one. Skipped
+        frames are counted in dropped_frames.
+        
+        Returns:
+            tuple: (ret, frame) like cv2.VideoCapture.read()
+        """
+        for grabbed in range(MAX_SKIPPED_FRAMES + 1):
+            start = time.perf_counter()
+            if not self.cap.grab():
+                self.dropped_frames += grabbed
+                return False, None
+            if time.perf_counter() - start > QUEUED_GRAB_MAX_S:
+                break
+        self.dropped_frames += grabbed
+        return self.cap.retrieve()
+    
+    def undistort_for_display(self, raw):
+        """
+        Undistort a raw frame into the next display buffer.
+        
+        Args:
+            raw (np.ndarray): Raw BGR camera frame
+        
+        Returns:
+            np.ndarray: Undistorted frame with the "Undistorted Feed" banner
+        """
+        out = self.next_display_buffer(raw.shape)
+        if self.undistort_source is None:
+            np.copyto(out, raw)
+        else:
+            self.undistort_source.undistort_frame(raw, dst=out)
+        
+        if self._banner is None:
+            sprite, mask, (ox, oy) = render_text_sprite(BANNER_TEXT, *BANNER_STYLE)
+            self._banner = (sprite, mask, (BANNER_ORIGIN[0] - ox, BANNER_ORIGIN[1] - oy))
+        stamp_sprite(out, *self._banner)
+        
+        return out
+    
+    def next_display_buffer(self, shape):
+        """
+        Get a display buffer that neither the pending nor the shown frame uses.
+        
+        Args:
+            shape (tuple): Frame shape
+        
+        Returns:
+            np.ndarray: Uninitialized BGR buffer
+        """
+        with self._latest_lock:
+            busy = (self._latest_buf, self._shown_buf)
+        return self._display_bufs.next(shape, busy=busy)
+    
+    def publish(self, frame, info):
+        """
+        Publish a frame for the GUI, replacing any frame it has not taken yet.
+        
+        Args:
+            frame (np.ndarray): BGR frame; not written again until the GUI
+                                has moved on from it
+            info (dict): Detection info
+        """
+        # Wrap for Qt without copying. A fresh QImage header per frame
+        # gives Qt a new cacheKey, so its texture cache never goes stale
+        qt_image = ndarray_to_qimage(frame)
+        with self._latest_lock:
+            self._latest = (qt_image, info)
+            self._latest_buf = frame
+    
+    def set_draw_overlay(self, enabled):
+        """
+        Enable or disable building the display image.
+        
+        When disabled, the plain preview frame (raw frame in 'measure' mode)
+        is published without the detection overlay, undistortion or banner.
+        Detection and the info dict are unaffected.
+        
+        Args:
+            enabled (bool): True while the live feed is on screen
+        """
+        self.draw_overlay = enabled
+    
+    def set_undistortion(self, measurement):
+        """
+        Set the undistortion source used in 'measure' mode.
+        
+        Args:
+            measurement (Measurement): Calibrated measurement module providing
+                                       undistort_frame()
+        """
+        self.undistort_source = measurement
+    
+    def set_mode(self, mode):
+        """
+        Select the per-frame work done for the consuming tab.
+        
+        Also resets detect_enabled: on for 'calib'/'extrin', off for 'measure'.
+        
+        Args:
+            mode (str): 'calib' or 'extrin' run ChArUco detection,
+                        'measure' only undistorts the raw feed
+        
+        Raises:
+            ValueError: If mode is unknown
+        """
+        if mode not in VIDEO_MODES:
+            raise ValueError(f"Unknown video mode: {mode}")
+        
+        self.mode = mode
+        self.detect_enabled = mode != 'measure'
+        self._frame_idx = 0
+        self._generation += 1
+        # Drop a frame processed for the previous mode
+        with self._latest_lock:
+            self._latest = None
+            self._latest_buf = None
+    
+    def get_processing_scale(self, frame_shape):
+        """
+        Compute the downscale factor that fits a frame into proc_size.
+        
+        Args:
+            frame_shape (tuple): Raw frame shape (height, width[, channels])
+        
+        Returns:
+            tuple: (scale, (width, height)) - scale is 1.0 if no resize is needed
+        """
+        h, w = frame_shape[:2]
+        scale = min(1.0, self.proc_size[0] / w, self.proc_size[1] / h)
+        return scale, (round(w * scale), round(h * scale))
+    
+    def take_latest(self):
+        """
+        Atomically take the newest frame published by the thread.
+        
+        The taken frame's buffer counts as shown (and is not reused) until
+        the next frame is taken.
+        
+        Returns:
+            tuple or None: (QImage, detection info dict), or None if no new
+                           frame arrived since the last call
+        """
+        with self._latest_lock:
+            latest, self._latest = self._latest, None
+            if latest is not None:
+                self._shown_buf, self._latest_buf = self._latest_buf, None
+        return latest
+    
+    def start(self):
+        """Start (or restart after stop()) the capture loop"""
+        self.running = True
+        self.dropped_frames = 0
+        super().start()
+    
     def stop(self):
         """Stop the video thread and release camera"""
         self.running = False
@@ -0,0 +1,92 @@
+"""
+Video Widget Module - GPU-Backed Frame Display
+
+Provides a QOpenGLWidget that shows camera frames letterboxed to the widget.
+Frames are drawn through Qt's OpenGL paint engine, which uploads them as a
+texture and lets the GPU sampler do the scaling, instead of rescaling a
+QPixmap on the CPU for every frame.
+"""
+
+from PyQt6.QtCore import Qt, QRectF, pyqtSignal
+from PyQt6.QtGui import QPainter, QPixmap, QColor
+from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+
+BACKGROUND_COLOR = QColor(0, 0, 0)
+PLACEHOLDER_COLOR = QColor(160, 160, 160)
+
+
+class VideoWidget(QOpenGLWidget):
+    """OpenGL surface that displays the latest frame with KeepAspectRatio scaling"""
+    
+    resized = pyqtSignal()
+    
+    def __init__(self, placeholder="", parent=None):
+        """
+        Initialize the video widget.
+        
+        Args:
+            placeholder (str): Text shown until the first frame arrives
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self._frame = None
+        self._smooth = False
+        self._placeholder = placeholder
+    
+    def set_frame(self, frame, smooth=False):
+        """
+        Show a new frame on the next repaint.
+        
+        Args:
+            frame (QImage or QPixmap): Frame to display
+            smooth (bool): Use linear filtering when scaling. Live feeds and
+                interactive redraws use nearest-neighbour; reserve smoothing
+                for final stills such as the measured-distance overlay
+        """
+        self._frame = frame
+        self._smooth = smooth
+        self.update()
+    
+    def frame(self):
+        """Return the frame currently displayed (QImage, QPixmap or None)"""
+        return self._frame
+    
+    def frame_rect(self):
+        """
+        Get the widget area the frame is drawn into.
+        
+        Returns:
+            QRectF: Centered KeepAspectRatio rectangle (empty if no frame)
+        """
+        if self._frame is None or self._frame.isNull():
+            return QRectF()
+        
+        size = self._frame.size()
+        size.scale(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+        return QRectF((self.width() - size.width()) / 2,
+                      (self.height() - size.height()) / 2,
+                      size.width(), size.height())
+    
+    def paintGL(self):
+        """Draw the frame as a scaled texture (or the placeholder text)"""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND_COLOR)
+        
+        if self._frame is None or self._frame.isNull():
+            painter.setPen(PLACEHOLDER_COLOR)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self._placeholder)
+        else:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, self._smooth)
+            target = self.frame_rect()
+            source = QRectF(self._frame.rect())
+            if isinstance(self._frame, QPixmap):
+                painter.drawPixmap(target, self._frame, source)
+            else:
+                painter.drawImage(target, self._frame, source)
+        
+        painter.end()
+    
+    def resizeEvent(self, event):
+        """Resize the GL surface and notify listeners (e.g. click mapping)"""
+        super().resizeEvent(event)
+        self.resized.emit()